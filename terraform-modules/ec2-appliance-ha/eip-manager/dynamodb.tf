@@ -0,0 +1,21 @@
+# Shared lock table for idempotency (one item per LifecycleActionToken) and
+# burst coalescing (one reconcile lock per ASG). Items expire via TTL.
+resource "aws_dynamodb_table" "locks" {
+  count = local.use_lock_table ? 1 : 0
+
+  name         = "${var.name_prefix}eip-manager-locks"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "pk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = var.tags
+}
@@ -10,7 +10,7 @@ resource "aws_cloudwatch_event_rule" "asg_lifecycle" {
       "EC2 Instance-terminate Lifecycle Action"
     ]
     detail = {
-      AutoScalingGroupName = [var.asg_name]
+      AutoScalingGroupName = keys(local.eip_mappings)
     }
   })
 
@@ -23,6 +23,55 @@ resource "aws_cloudwatch_event_target" "lambda" {
   arn       = aws_lambda_function.eip_manager.arn
 }
 
+# Spot interruption warnings and rebalance recommendations arrive ~2 minutes
+# before the terminate lifecycle action, allowing the EIP to move early.
+# These EC2 events cannot be filtered by ASG, so the Lambda ignores any event
+# whose instance is not the current EIP holder (one DescribeAddresses call).
+resource "aws_cloudwatch_event_rule" "spot_interruption" {
+  count = var.spot_interruption_failover ? 1 : 0
+
+  name_prefix = "${var.name_prefix}spot-interrupt-"
+  description = "Capture EC2 spot interruption signals for early EIP failover"
+
+  event_pattern = jsonencode({
+    source = ["aws.ec2"]
+    detail-type = [
+      "EC2 Spot Instance Interruption Warning",
+      "EC2 Instance Rebalance Recommendation"
+    ]
+  })
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_event_target" "spot_interruption_lambda" {
+  count = var.spot_interruption_failover ? 1 : 0
+
+  rule      = aws_cloudwatch_event_rule.spot_interruption[0].name
+  target_id = "${var.name_prefix}eip-manager-spot"
+  arn       = aws_lambda_function.eip_manager.arn
+}
+
+# Periodic fleet-wide reconcile: one batched set of describe calls for all
+# mapped ASGs, then one associate per EIP left without an instance.
+resource "aws_cloudwatch_event_rule" "reconcile" {
+  count = var.reconcile_schedule_expression != null ? 1 : 0
+
+  name_prefix         = "${var.name_prefix}eip-reconcile-"
+  description         = "Periodically associate unassociated EIPs across all managed ASGs"
+  schedule_expression = var.reconcile_schedule_expression
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_event_target" "reconcile_lambda" {
+  count = var.reconcile_schedule_expression != null ? 1 : 0
+
+  rule      = aws_cloudwatch_event_rule.reconcile[0].name
+  target_id = "${var.name_prefix}eip-manager-reconcile"
+  arn       = aws_lambda_function.eip_manager.arn
+}
+
 # NOTE: EC2 state-change rule removed intentionally.
 # ASG lifecycle hooks handle ALL terminations including:
 # - Manual termination (console/CLI/API)
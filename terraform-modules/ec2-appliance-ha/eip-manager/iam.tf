@@ -1,6 +1,13 @@
 data "aws_caller_identity" "current" {}
 data "aws_region" "current" {}
 
+locals {
+  eip_arns = [
+    for allocation_id in local.eip_allocation_ids :
+    "arn:aws:ec2:${data.aws_region.current.id}:${data.aws_caller_identity.current.account_id}:elastic-ip/${allocation_id}"
+  ]
+}
+
 data "aws_iam_policy_document" "lambda_assume_role" {
   statement {
     effect = "Allow"
@@ -21,11 +28,10 @@ data "aws_iam_policy_document" "lambda_permissions" {
       "ec2:AssociateAddress",
       "ec2:DisassociateAddress"
     ]
-    resources = [
-      "arn:aws:ec2:${data.aws_region.current.id}:${data.aws_caller_identity.current.account_id}:elastic-ip/${var.eip_allocation_id}",
+    resources = concat(local.eip_arns, [
       "arn:aws:ec2:${data.aws_region.current.id}:${data.aws_caller_identity.current.account_id}:instance/*",
       "arn:aws:ec2:${data.aws_region.current.id}:${data.aws_caller_identity.current.account_id}:network-interface/*"
-    ]
+    ])
     condition {
       test     = "StringEquals"
       variable = "ec2:ResourceTag/${var.resource_tag_key}"
@@ -33,7 +39,7 @@ data "aws_iam_policy_document" "lambda_permissions" {
     }
   }
 
-  # Allow EIP operations on the specific EIP (EIPs don't support tag conditions for associate/disassociate)
+  # Allow EIP operations on the specific EIPs (EIPs don't support tag conditions for associate/disassociate)
   statement {
     sid    = "EIPOperationsOnSpecificEIP"
     effect = "Allow"
@@ -41,9 +47,7 @@ data "aws_iam_policy_document" "lambda_permissions" {
       "ec2:AssociateAddress",
       "ec2:DisassociateAddress"
     ]
-    resources = [
-      "arn:aws:ec2:${data.aws_region.current.id}:${data.aws_caller_identity.current.account_id}:elastic-ip/${var.eip_allocation_id}"
-    ]
+    resources = local.eip_arns
   }
 
   # Describe operations - read-only, scoped where possible
@@ -74,7 +78,7 @@ data "aws_iam_policy_document" "lambda_permissions" {
     resources = ["*"]
   }
 
-  # ASG lifecycle operations - scoped to specific ASG ARN
+  # ASG lifecycle operations - scoped to specific ASG ARNs
   statement {
     sid    = "ASGLifecycleOperations"
     effect = "Allow"
@@ -82,7 +86,22 @@ data "aws_iam_policy_document" "lambda_permissions" {
       "autoscaling:CompleteLifecycleAction",
       "autoscaling:RecordLifecycleActionHeartbeat"
     ]
-    resources = [var.asg_arn]
+    resources = local.asg_arns
+  }
+
+  # Idempotency / coalescing locks - scoped to the lock table
+  dynamic "statement" {
+    for_each = local.use_lock_table ? [1] : []
+    content {
+      sid    = "LockTableOperations"
+      effect = "Allow"
+      actions = [
+        "dynamodb:PutItem",
+        "dynamodb:GetItem",
+        "dynamodb:DeleteItem"
+      ]
+      resources = [aws_dynamodb_table.locks[0].arn]
+    }
   }
 }
 
@@ -99,6 +118,14 @@ resource "aws_iam_role_policy_attachment" "lambda_basic_execution" {
   policy_arn = "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
 }
 
+# ENI management for a VPC-attached Lambda (health checks)
+resource "aws_iam_role_policy_attachment" "lambda_vpc_access" {
+  count = local.vpc_attached ? 1 : 0
+
+  role       = aws_iam_role.lambda.name
+  policy_arn = "arn:aws:iam::aws:policy/service-role/AWSLambdaVPCAccessExecutionRole"
+}
+
 # Custom policy for EC2/ASG operations with conditions
 resource "aws_iam_role_policy" "lambda" {
   name_prefix = "${var.name_prefix}eip-manager-"
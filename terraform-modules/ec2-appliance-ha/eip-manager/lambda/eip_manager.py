@@ -4,28 +4,67 @@ EIP Manager Lambda Function
 Handles EIP failover for hot-standby and cold-standby deployments.
 Triggered by ASG lifecycle events via EventBridge.
 
+A single function can manage many ASGs, each with one or more EIPs
+(e.g. one EIP per AZ or per appliance role), configured via EIP_MAPPINGS.
+Each instance holds at most one managed EIP.
+
 Design Principles:
 - AVAILABILITY FIRST: EIP is never moved between running healthy instances.
   This ensures zero-downtime during rolling updates (instance refresh, AMI updates).
 - EIP transfers only occur when:
   1. No instance currently has the EIP (initial launch, after failure)
   2. The current EIP holder terminates (termination hook handles transfer)
+  3. The current EIP holder receives a spot interruption warning or rebalance
+     recommendation (hot-standby only, moves EIP before the termination hook fires)
 - prefer_on_demand affects initial assignment and termination failover order,
   but does NOT cause EIP to be "stolen" from a running spot instance.
+- Describe calls are batched: one DescribeAddresses for all EIPs, one
+  DescribeAutoScalingGroups for all ASGs, one DescribeInstances for lifecycles.
+
+Duplicate deliveries are dropped by LifecycleActionToken (or EventBridge event
+id). With COALESCE_WINDOW_SECONDS set, lifecycle bursts (e.g. instance refresh)
+are resolved by one reconcile per ASG and window instead of one per event.
+Lifecycle events of ASGs with more than one EIP always take the per-ASG lock
+(with a zero window when coalescing is off): concurrent per-event handlers
+would otherwise pick the same free instance for different EIPs. Spot moves and
+the scheduled reconcile plan under the same lock.
+
+Each handled event emits CloudWatch Embedded Metric Format (EMF) log lines:
+event age at receipt, latency/retries per AWS call, time to EIP association,
+and the decision taken (skip, associate, failover, none-healthy, disassociate).
+
+boto3 clients are created lazily on first use from one shared session, with
+short timeouts and adaptive retries so a hung call cannot eat the failover
+window. The first invocation logs its cold-start budget.
+
+With HEALTH_CHECK_PORT set, failover targets are also probed concurrently on
+their private IPs (TCP connect, or HTTP GET of HEALTH_CHECK_PATH) within one
+deadline. Instances passing the probe rank first, then on-demand over spot,
+then by probe latency. InService alone does not mean the appliance is serving.
 """
 
+import functools
+import http.client
 import json
 import logging
 import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+# Taken before the botocore import, which is most of module init
+INIT_STARTED = time.monotonic()
 
-import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config  # noqa: E402
+from botocore.exceptions import BotoCoreError, ClientError  # noqa: E402
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-ec2 = boto3.client("ec2")
-autoscaling = boto3.client("autoscaling")
+# API errors (ClientError) and transport errors such as connect/read timeouts
+AWS_ERRORS = (ClientError, BotoCoreError)
 
 # Configuration from environment (read once at cold start)
 EIP_ALLOCATION_ID = os.environ.get("EIP_ALLOCATION_ID")
@@ -33,130 +72,750 @@ DEPLOYMENT_MODE = os.environ.get("DEPLOYMENT_MODE", "hot-standby")
 ASG_NAME = os.environ.get("ASG_NAME")
 PREFER_ON_DEMAND = os.environ.get("PREFER_ON_DEMAND", "false").lower() == "true"
 
+SPOT_INTERRUPTION_DETAIL_TYPES = (
+    "EC2 Spot Instance Interruption Warning",
+    "EC2 Instance Rebalance Recommendation",
+)
 
-def get_eip_info(allocation_id: str) -> dict:
-    """Get current EIP association information."""
+# Upper bound on concurrent associate calls; also sizes the connection pool
+MAX_PARALLEL_CALLS = 10
+
+# EC2/ASG calls normally answer well under a second; fail fast and retry
+# rather than waiting on botocore's 60s defaults during a failover
+BOTO_CONFIG = Config(
+    connect_timeout=2,
+    read_timeout=5,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    max_pool_connections=MAX_PARALLEL_CALLS,
+)
+
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "EIPManager")
+
+# Idempotency / coalescing. LOCK_TABLE (DynamoDB) is shared by all concurrent
+# invocations; the in-memory default only spans one container.
+LOCK_TABLE = os.environ.get("LOCK_TABLE")
+COALESCE_WINDOW_SECONDS = float(os.environ.get("COALESCE_WINDOW_SECONDS", "0"))
+
+# Covers EventBridge's 24h retry window for Lambda targets
+IDEMPOTENCY_TTL_SECONDS = 86400
+
+# While an event is being handled its key only outlives the invocation by a
+# margin, so the retry of a timed-out or crashed invocation is not dropped.
+# Used when the Lambda context (remaining time) is not available.
+EVENT_IN_PROGRESS_TTL_SECONDS = 60
+EVENT_IN_PROGRESS_MARGIN_SECONDS = 5
+
+# Upper bound for one reconcile after the coalescing window
+RECONCILE_LOCK_TTL_SECONDS = 15
+
+# Waiting invocations poll the lock with exponential backoff; with DynamoDB
+# every poll is a GetItem
+LOCK_POLL_SECONDS = 0.5
+LOCK_POLL_MAX_SECONDS = 2
+
+PENDING_STATES = ("Pending", "Pending:Wait", "Pending:Proceed")
+
+# Optional application-level probe of failover targets (Lambda must run in the VPC)
+HEALTH_CHECK_PORT = int(os.environ.get("HEALTH_CHECK_PORT") or 0)
+HEALTH_CHECK_PATH = os.environ.get("HEALTH_CHECK_PATH") or None
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.environ.get("HEALTH_CHECK_TIMEOUT_SECONDS", "1"))
+
+# Probes are plain sockets, not limited by the boto3 connection pool
+MAX_PARALLEL_PROBES = 32
+
+
+class FailoverMetrics:
+    """Per-invocation failover timings, emitted as CloudWatch EMF log lines.
+
+    https://docs.aws.amazon.com/AmazonCloudWatch/latest/monitoring/CloudWatch_Embedded_Metric_Format_Specification.html
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, event_time: str = None) -> None:
+        """Start measuring a new invocation, received now for an event sent at event_time."""
+        self.handler = ""
+        self.start = time.monotonic()
+        self.event_age_ms = None
+        self.calls = []
+        self.init_ms = None
+        self.client_setup_ms = 0.0
+        self.lock_calls = 0
+        self.lock_ms = 0.0
+        self.decision = "none"
+        self.association_ms = None
+        self.properties = {}
+
+        if event_time:
+            try:
+                sent = datetime.fromisoformat(event_time.replace("Z", "+00:00"))
+                self.event_age_ms = max(
+                    (datetime.now(timezone.utc) - sent).total_seconds() * 1000, 0
+                )
+            except ValueError:
+                logger.warning(f"Unparseable event time: {event_time}")
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.start) * 1000
+
+    def record_call(self, operation: str, latency_ms: float, retries: int) -> None:
+        # list.append is atomic, safe from associate_eips worker threads
+        self.calls.append((operation, latency_ms, retries))
+
+    def record_client_setup(self, latency_ms: float) -> None:
+        self.client_setup_ms += latency_ms
+
+    def record_lock_call(self, latency_ms: float) -> None:
+        """Lock store calls are counted apart from the EC2/ASG failover calls."""
+        self.lock_calls += 1
+        self.lock_ms += latency_ms
+
+    def mark_associated(self) -> None:
+        """Record the time the EIP(s) reached their new instance."""
+        self.association_ms = self.elapsed_ms()
+
+    def emit(self) -> None:
+        """Print one EMF record per AWS call and one invocation summary.
+
+        EMF must be a bare JSON log line, so print() is used instead of logger.
+        """
+        timestamp = int(time.time() * 1000)
+        for operation, latency_ms, retries in self.calls:
+            record = self._record(
+                timestamp,
+                [["Operation"]],
+                {
+                    "ApiLatency": ("Milliseconds", latency_ms),
+                    "ApiRetries": ("Count", retries),
+                },
+                {"Operation": operation, "Handler": self.handler},
+            )
+            print(json.dumps(record))
+
+        values = {
+            "HandlerDuration": ("Milliseconds", self.elapsed_ms()),
+            "ApiCalls": ("Count", len(self.calls)),
+        }
+        if self.event_age_ms is not None:
+            values["EventAge"] = ("Milliseconds", self.event_age_ms)
+        if self.association_ms is not None:
+            # Measured from the event time when known, so it covers delivery delay
+            values["TimeToAssociation"] = (
+                "Milliseconds", (self.event_age_ms or 0) + self.association_ms
+            )
+        if self.init_ms is not None:
+            values["InitDuration"] = ("Milliseconds", self.init_ms)
+        if self.client_setup_ms:
+            values["ClientSetup"] = ("Milliseconds", self.client_setup_ms)
+        if self.lock_calls:
+            values["LockCalls"] = ("Count", self.lock_calls)
+            values["LockLatency"] = ("Milliseconds", self.lock_ms)
+        if self.init_ms is not None:
+            logger.info(
+                f"Cold start budget: module init {self.init_ms:.0f} ms, "
+                f"client setup {self.client_setup_ms:.0f} ms, "
+                f"handler {self.elapsed_ms():.0f} ms"
+            )
+        record = self._record(
+            timestamp,
+            [["Handler", "Decision"]],
+            values,
+            {"Handler": self.handler, "Decision": self.decision, **self.properties},
+        )
+        print(json.dumps(record))
+
+    @staticmethod
+    def _record(
+        timestamp: int, dimensions: list, values: dict, properties: dict
+    ) -> dict:
+        return {
+            "_aws": {
+                "Timestamp": timestamp,
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": METRICS_NAMESPACE,
+                        "Dimensions": dimensions,
+                        "Metrics": [
+                            {"Name": name, "Unit": unit}
+                            for name, (unit, _) in values.items()
+                        ],
+                    }
+                ],
+            },
+            **properties,
+            **{name: value for name, (_, value) in values.items()},
+        }
+
+
+metrics = FailoverMetrics()
+
+
+def instrumented(handler):
+    """Emit FailoverMetrics for every call of an event handler."""
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        metrics.handler = handler.__name__
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            metrics.emit()
+
+    return wrapper
+
+
+# Shared boto3 clients, created on first use; tests may pre-populate this
+clients = {}
+_clients_lock = threading.Lock()
+_session = None
+
+
+def get_client(service: str):
+    """Return the shared client for service, creating it on first use.
+
+    Creation is serialized because boto3 sessions are not thread-safe, and
+    associate_eips calls from worker threads.
+    """
+    client = clients.get(service)
+    if client is not None:
+        return client
+
+    global _session
+    with _clients_lock:
+        if service not in clients:
+            start = time.monotonic()
+            if _session is None:
+                import boto3
+
+                _session = boto3.session.Session()
+            clients[service] = _session.client(service, config=BOTO_CONFIG)
+            metrics.record_client_setup((time.monotonic() - start) * 1000)
+        return clients[service]
+
+
+def call_aws(service: str, operation: str, **kwargs) -> dict:
+    """Call a boto3 client operation, recording its latency and retry count."""
+    client = get_client(service)
+    start = time.monotonic()
+    retries = 0
     try:
-        response = ec2.describe_addresses(AllocationIds=[allocation_id])
-        if response["Addresses"]:
-            return response["Addresses"][0]
+        response = getattr(client, operation)(**kwargs)
+        retries = response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        return response
     except ClientError as e:
-        logger.error(f"Failed to describe EIP: {e}")
+        retries = e.response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        raise
+    finally:
+        metrics.record_call(operation, (time.monotonic() - start) * 1000, retries)
+
+
+class MemoryLockStore:
+    """In-process lock store with expiry.
+
+    Only spans one warm Lambda container; used by default and in tests.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._mutex = threading.Lock()
+
+    def acquire(self, key: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._mutex:
+            if self._locks.get(key, 0) > now:
+                return False
+            self._locks[key] = now + ttl_seconds
+            return True
+
+    def renew(self, key: str, ttl_seconds: float) -> None:
+        with self._mutex:
+            self._locks[key] = time.time() + ttl_seconds
+
+    def release(self, key: str) -> None:
+        with self._mutex:
+            self._locks.pop(key, None)
+
+    def held(self, key: str) -> bool:
+        return self._locks.get(key, 0) > time.time()
+
+
+class DynamoDBLockStore:
+    """Lock store backed by a DynamoDB table shared by all invocations.
+
+    The table has partition key "pk" (string) and TTL attribute "expires_at".
+    Locks are taken with a conditional PutItem, so at most one caller wins.
+    """
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+
+    def _call(self, operation: str, **kwargs) -> dict:
+        # Not call_aws: lock traffic is kept out of ApiCalls and the per-call EMF lines
+        client = get_client("dynamodb")
+        start = time.monotonic()
+        try:
+            return getattr(client, operation)(TableName=self.table_name, **kwargs)
+        finally:
+            metrics.record_lock_call((time.monotonic() - start) * 1000)
+
+    def acquire(self, key: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        try:
+            self._call(
+                "put_item",
+                Item={
+                    "pk": {"S": key},
+                    "expires_at": {"N": str(int(now + ttl_seconds) + 1)},
+                },
+                ConditionExpression="attribute_not_exists(pk) OR expires_at < :now",
+                ExpressionAttributeValues={":now": {"N": str(int(now))}},
+            )
+            return True
+        except AWS_ERRORS as e:
+            error = getattr(e, "response", {}).get("Error", {})
+            if error.get("Code") == "ConditionalCheckFailedException":
+                return False
+            # Fail open: handling an event twice is safer than never handling it
+            logger.error(f"Failed to acquire lock {key}: {e}")
+            return True
+
+    def renew(self, key: str, ttl_seconds: float) -> None:
+        try:
+            self._call(
+                "put_item",
+                Item={
+                    "pk": {"S": key},
+                    "expires_at": {"N": str(int(time.time() + ttl_seconds) + 1)},
+                },
+            )
+        except AWS_ERRORS as e:
+            logger.error(f"Failed to renew lock {key}: {e}")
+
+    def release(self, key: str) -> None:
+        try:
+            self._call("delete_item", Key={"pk": {"S": key}})
+        except AWS_ERRORS as e:
+            logger.error(f"Failed to release lock {key}: {e}")
+
+    def held(self, key: str) -> bool:
+        try:
+            response = self._call(
+                "get_item",
+                Key={"pk": {"S": key}},
+                ConsistentRead=True,
+            )
+        except AWS_ERRORS as e:
+            logger.error(f"Failed to read lock {key}: {e}")
+            return False
+        item = response.get("Item")
+        return bool(item) and float(item["expires_at"]["N"]) > time.time()
+
+
+def make_lock_store():
+    """Pick the lock store from configuration: DynamoDB when LOCK_TABLE is set, else memory."""
+    if LOCK_TABLE:
+        return DynamoDBLockStore(LOCK_TABLE)
+    return MemoryLockStore()
+
+
+lock_store = make_lock_store()
+
+
+def load_eip_mappings() -> dict:
+    """Load the ASG name -> EIP allocation IDs mapping.
+
+    EIP_MAPPINGS is a JSON object, e.g. {"asg-a": ["eipalloc-1", "eipalloc-2"]}.
+    Falls back to the single EIP_ALLOCATION_ID/ASG_NAME pair when unset.
+    """
+    raw = os.environ.get("EIP_MAPPINGS")
+    if raw:
+        try:
+            mappings = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid EIP_MAPPINGS: {e}")
+            return {}
+        return {
+            asg_name: ids if isinstance(ids, list) else [ids]
+            for asg_name, ids in mappings.items()
+        }
+    if EIP_ALLOCATION_ID and ASG_NAME:
+        return {ASG_NAME: [EIP_ALLOCATION_ID]}
     return {}
 
 
+EIP_MAPPINGS = load_eip_mappings()
+
+# Module import/setup time including botocore, excluding the deferred client creation
+INIT_DURATION_MS = (time.monotonic() - INIT_STARTED) * 1000
+
+
+def get_eip_infos(allocation_ids: list) -> dict:
+    """Get association information for multiple EIPs in a single API call.
+
+    Returns dict mapping allocation_id -> address description. EIPs that could
+    not be described are missing from the result. One deleted or mistyped
+    allocation ID fails the whole batch, so the EIPs are then described one
+    by one and only the bad ID is left out.
+    """
+    if not allocation_ids:
+        return {}
+
+    try:
+        response = call_aws(
+            "ec2", "describe_addresses", AllocationIds=list(allocation_ids)
+        )
+        return {address["AllocationId"]: address for address in response["Addresses"]}
+    except AWS_ERRORS as e:
+        logger.error(f"Failed to describe EIPs: {e}")
+        error_code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
+        if len(allocation_ids) == 1 or not error_code.startswith("InvalidAllocationID"):
+            return {}
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(allocation_ids), MAX_PARALLEL_CALLS)
+    ) as executor:
+        results = executor.map(lambda a: get_eip_infos([a]), allocation_ids)
+        return {a: info for result in results for a, info in result.items()}
+
+
+def get_eip_info(allocation_id: str) -> dict:
+    """Get current EIP association information."""
+    return get_eip_infos([allocation_id]).get(allocation_id, {})
+
+
 def get_instance_lifecycle(instance_id: str) -> str:
     """Get instance lifecycle type (spot or on-demand).
 
     Returns 'spot', 'on-demand', or 'unknown'.
     """
     try:
-        response = ec2.describe_instances(InstanceIds=[instance_id])
+        response = call_aws("ec2", "describe_instances", InstanceIds=[instance_id])
         if response["Reservations"] and response["Reservations"][0]["Instances"]:
             # InstanceLifecycle is only present for spot instances
             return response["Reservations"][0]["Instances"][0].get(
                 "InstanceLifecycle", "on-demand"
             )
-    except ClientError as e:
+    except AWS_ERRORS as e:
         logger.error(f"Failed to describe instance {instance_id}: {e}")
     return "unknown"
 
 
-def get_instance_lifecycles_batch(instance_ids: list) -> dict:
-    """Get lifecycle types for multiple instances in a single API call.
+def get_instance_details_batch(instance_ids: list) -> dict:
+    """Get lifecycle type and private IP for multiple instances in a single API call.
 
-    Returns dict mapping instance_id -> lifecycle ('spot' or 'on-demand').
+    Returns dict mapping instance_id -> {"lifecycle": ..., "private_ip": ...}.
     """
     if not instance_ids:
         return {}
 
     try:
-        response = ec2.describe_instances(InstanceIds=instance_ids)
+        response = call_aws("ec2", "describe_instances", InstanceIds=instance_ids)
         result = {}
         for reservation in response["Reservations"]:
             for instance in reservation["Instances"]:
-                instance_id = instance["InstanceId"]
-                # InstanceLifecycle is only present for spot instances
-                result[instance_id] = instance.get("InstanceLifecycle", "on-demand")
+                result[instance["InstanceId"]] = {
+                    # InstanceLifecycle is only present for spot instances
+                    "lifecycle": instance.get("InstanceLifecycle", "on-demand"),
+                    "private_ip": instance.get("PrivateIpAddress"),
+                }
         return result
-    except ClientError as e:
+    except AWS_ERRORS as e:
         logger.error(f"Failed to batch describe instances: {e}")
-        return {inst_id: "unknown" for inst_id in instance_ids}
+        return {
+            inst_id: {"lifecycle": "unknown", "private_ip": None}
+            for inst_id in instance_ids
+        }
+
+
+def get_instance_lifecycles_batch(instance_ids: list) -> dict:
+    """Get lifecycle types for multiple instances in a single API call.
+
+    Returns dict mapping instance_id -> lifecycle ('spot' or 'on-demand').
+    """
+    return {
+        inst_id: details["lifecycle"]
+        for inst_id, details in get_instance_details_batch(instance_ids).items()
+    }
+
+
+def probe_instance(private_ip: str, port: int, path: str = None, timeout: float = 1.0):
+    """Check that an instance's application is serving.
+
+    TCP connect to port, or HTTP GET of path expecting a status below 400.
+    Returns the probe latency in ms, or None if the probe failed.
+    """
+    start = time.monotonic()
+    try:
+        if path:
+            conn = http.client.HTTPConnection(private_ip, port, timeout=timeout)
+            try:
+                conn.request("GET", path)
+                if conn.getresponse().status >= 400:
+                    return None
+            finally:
+                conn.close()
+        else:
+            with socket.create_connection((private_ip, port), timeout=timeout):
+                pass
+    except (OSError, http.client.HTTPException):
+        return None
+    return (time.monotonic() - start) * 1000
+
+
+def probe_instances(
+    private_ips: dict, port: int, path: str = None, deadline_seconds: float = 1.0
+) -> dict:
+    """Probe instances concurrently within one overall deadline.
+
+    Returns dict mapping instance_id -> latency in ms, or None when the probe
+    failed, the instance has no private IP, or the deadline passed first.
+    """
+    results = {inst_id: None for inst_id in private_ips}
+    targets = {inst_id: ip for inst_id, ip in private_ips.items() if ip}
+    if not targets:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=min(len(targets), MAX_PARALLEL_PROBES))
+    futures = {
+        executor.submit(probe_instance, ip, port, path, deadline_seconds): inst_id
+        for inst_id, ip in targets.items()
+    }
+    done, _ = wait(futures, timeout=deadline_seconds)
+    for future in done:
+        results[futures[future]] = future.result()
+    # Don't wait for stragglers, their own timeout ends them
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Health probes (ms, None = failed): {results}")
+    metrics.properties["ProbeFailures"] = sum(1 for r in results.values() if r is None)
+    return results
+
+
+def rank_instances(
+    instance_ids: list, details: dict, probe_results: dict, prefer_on_demand: bool
+) -> list:
+    """Order failover targets.
+
+    Instances that passed their probe come first, then on-demand before spot
+    when prefer_on_demand, then lower probe latency. Without probe results the
+    order is just the on-demand preference, otherwise unchanged.
+    """
+
+    def key(inst_id):
+        latency = probe_results.get(inst_id)
+        probe_failed = bool(probe_results) and latency is None
+        is_spot = (
+            prefer_on_demand and details.get(inst_id, {}).get("lifecycle") == "spot"
+        )
+        return (probe_failed, is_spot, latency or 0)
+
+    return sorted(instance_ids, key=key)
+
+
+def probe_candidates(instance_ids: list, details: dict) -> dict:
+    """Probe instance_ids when HEALTH_CHECK_PORT is configured, else return {}."""
+    if not HEALTH_CHECK_PORT or not instance_ids:
+        return {}
+    probe_results = probe_instances(
+        {i: details.get(i, {}).get("private_ip") for i in instance_ids},
+        HEALTH_CHECK_PORT,
+        HEALTH_CHECK_PATH,
+        HEALTH_CHECK_TIMEOUT_SECONDS,
+    )
+    if all(latency is None for latency in probe_results.values()):
+        # Keep failing over: the EIP would be lost with the terminating holder anyway
+        logger.warning("All health probes failed, using unprobed target order")
+    return probe_results
+
+
+def get_asg_instance_states(asg_names: list) -> dict:
+    """Get instance lifecycle states for multiple ASGs in a single paginated API call.
+
+    Returns dict mapping asg_name -> {instance_id: LifecycleState}.
+    """
+    result = {asg_name: {} for asg_name in asg_names}
+    if not asg_names:
+        return result
+
+    try:
+        kwargs = {"AutoScalingGroupNames": list(asg_names), "MaxRecords": 100}
+        while True:
+            response = call_aws(
+                "autoscaling", "describe_auto_scaling_groups", **kwargs
+            )
+            for group in response["AutoScalingGroups"]:
+                result[group["AutoScalingGroupName"]] = {
+                    instance["InstanceId"]: instance["LifecycleState"]
+                    for instance in group["Instances"]
+                }
+            if not response.get("NextToken"):
+                break
+            kwargs["NextToken"] = response["NextToken"]
+    except AWS_ERRORS as e:
+        logger.error(f"Failed to describe ASGs: {e}")
+    return result
+
+
+def get_asg_instances(asg_names: list) -> dict:
+    """Get InService instance IDs for multiple ASGs in a single paginated API call.
+
+    Returns dict mapping asg_name -> list of instance_ids.
+    """
+    return {
+        asg_name: [i for i, state in states.items() if state == "InService"]
+        for asg_name, states in get_asg_instance_states(asg_names).items()
+    }
+
+
+def get_healthy_instances_batch(
+    asg_names: list,
+    exclude_instance_ids: list = (),
+    prefer_on_demand: bool = False,
+    probe_results: dict = None,
+) -> dict:
+    """Get healthy instances for multiple ASGs.
+
+    Returns dict mapping asg_name -> list in the same format as
+    get_healthy_instances, best target first. Lifecycles and private IPs for
+    all ASGs are fetched in one call, and probed together when configured.
+    If probe_results is given, it is filled with the probe outcome per
+    instance (latency in ms, None = failed); it stays empty without probing.
+    """
+    healthy = {
+        asg_name: [i for i in instance_ids if i not in exclude_instance_ids]
+        for asg_name, instance_ids in get_asg_instances(asg_names).items()
+    }
+
+    if not prefer_on_demand and not HEALTH_CHECK_PORT:
+        return healthy
+
+    # Lifecycles and private IPs for all ASGs in a single batch API call
+    all_instances = [i for instance_ids in healthy.values() for i in instance_ids]
+    details = get_instance_details_batch(all_instances)
+    probes = probe_candidates(all_instances, details)
+    if probe_results is not None:
+        probe_results.update(probes)
+
+    result = {}
+    for asg_name, instance_ids in healthy.items():
+        ranked = rank_instances(instance_ids, details, probes, prefer_on_demand)
+        logger.info(f"{asg_name}: failover order {ranked}")
+        if prefer_on_demand:
+            result[asg_name] = [
+                (inst_id, details.get(inst_id, {}).get("lifecycle", "on-demand"))
+                for inst_id in ranked
+            ]
+        else:
+            result[asg_name] = ranked
+    return result
 
 
 def get_healthy_instances(
-    asg_name: str, exclude_instance_id: str = None, prefer_on_demand: bool = False
+    asg_name: str,
+    exclude_instance_id: str = None,
+    prefer_on_demand: bool = False,
+    probe_results: dict = None,
 ) -> list:
     """Get list of healthy instances in the ASG.
 
     If prefer_on_demand is True, on-demand instances are returned first.
+    With HEALTH_CHECK_PORT set, instances passing the health probe come first.
     Returns list of (instance_id, lifecycle) tuples when prefer_on_demand=True,
     otherwise returns list of instance_ids for backward compatibility.
     """
-    try:
-        response = autoscaling.describe_auto_scaling_groups(
-            AutoScalingGroupNames=[asg_name]
-        )
-        if not response["AutoScalingGroups"]:
-            return []
-
-        instances = []
-        for instance in response["AutoScalingGroups"][0]["Instances"]:
-            if instance["LifecycleState"] == "InService":
-                if (
-                    exclude_instance_id
-                    and instance["InstanceId"] == exclude_instance_id
-                ):
-                    continue
-                instances.append(instance["InstanceId"])
-
-        # Sort by lifecycle preference: on-demand first, then spot
-        if prefer_on_demand and instances:
-            # Single batch API call instead of N individual calls
-            lifecycles = get_instance_lifecycles_batch(instances)
-
-            on_demand = []
-            spot = []
-            for inst_id in instances:
-                if lifecycles.get(inst_id) == "spot":
-                    spot.append((inst_id, "spot"))
-                else:
-                    on_demand.append((inst_id, lifecycles.get(inst_id, "on-demand")))
+    exclude = [exclude_instance_id] if exclude_instance_id else []
+    return get_healthy_instances_batch(
+        [asg_name], exclude, prefer_on_demand, probe_results
+    )[asg_name]
 
-            logger.info(
-                f"On-demand instances: {[i[0] for i in on_demand]}, "
-                f"Spot instances: {[i[0] for i in spot]}"
-            )
-            return on_demand + spot
 
-        return instances
-    except ClientError as e:
-        logger.error(f"Failed to describe ASG: {e}")
-    return []
+def healthy_instance_ids(healthy_instances: list, prefer_on_demand: bool) -> list:
+    """Extract instance IDs from a get_healthy_instances result."""
+    if prefer_on_demand:
+        return [inst_id for inst_id, _ in healthy_instances]
+    return list(healthy_instances)
+
+
+def plan_eip_assignments(
+    allocation_ids: list,
+    eip_infos: dict,
+    candidates: list,
+    exclude_instance_ids: list = (),
+) -> list:
+    """Plan which EIPs to associate with which instances.
+
+    EIPs held by an instance outside exclude_instance_ids stay where they are.
+    Every other EIP is paired, in order, with the next candidate that does not
+    already hold one of allocation_ids, so no instance ends up with two EIPs.
+    EIPs missing from eip_infos (describe failed) are left untouched.
+
+    Returns list of (allocation_id, instance_id) tuples.
+    """
+    holders = {
+        eip_infos[a].get("InstanceId") for a in allocation_ids if a in eip_infos
+    }
+    unplaced = [
+        a
+        for a in allocation_ids
+        if a in eip_infos
+        and (
+            not eip_infos[a].get("InstanceId")
+            or eip_infos[a]["InstanceId"] in exclude_instance_ids
+        )
+    ]
+    available = []
+    for inst_id in candidates:
+        if (
+            inst_id not in holders
+            and inst_id not in exclude_instance_ids
+            and inst_id not in available
+        ):
+            available.append(inst_id)
+    return list(zip(unplaced, available))
 
 
 def associate_eip(allocation_id: str, instance_id: str) -> bool:
     """Associate EIP with an instance."""
     try:
-        ec2.associate_address(
+        call_aws(
+            "ec2",
+            "associate_address",
             AllocationId=allocation_id,
             InstanceId=instance_id,
             AllowReassociation=True,
         )
         logger.info(f"Associated EIP {allocation_id} with instance {instance_id}")
         return True
-    except ClientError as e:
+    except AWS_ERRORS as e:
         logger.error(f"Failed to associate EIP: {e}")
         return False
 
 
+def associate_eips(assignments: list) -> dict:
+    """Associate several EIPs concurrently.
+
+    Returns dict mapping allocation_id -> success.
+    """
+    if len(assignments) <= 1:
+        return {a: associate_eip(a, inst_id) for a, inst_id in assignments}
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(assignments), MAX_PARALLEL_CALLS)
+    ) as executor:
+        futures = {
+            a: executor.submit(associate_eip, a, inst_id) for a, inst_id in assignments
+        }
+        return {a: future.result() for a, future in futures.items()}
+
+
 def disassociate_eip(association_id: str) -> bool:
     """Disassociate EIP from current instance."""
     try:
-        ec2.disassociate_address(AssociationId=association_id)
+        call_aws("ec2", "disassociate_address", AssociationId=association_id)
         logger.info(f"Disassociated EIP association {association_id}")
         return True
-    except ClientError as e:
+    except AWS_ERRORS as e:
         logger.error(f"Failed to disassociate EIP: {e}")
         return False
 
@@ -170,7 +829,9 @@ def complete_lifecycle_action(
 ) -> None:
     """Complete the ASG lifecycle action."""
     try:
-        autoscaling.complete_lifecycle_action(
+        call_aws(
+            "autoscaling",
+            "complete_lifecycle_action",
             AutoScalingGroupName=asg_name,
             LifecycleHookName=lifecycle_hook_name,
             InstanceId=instance_id,
@@ -180,13 +841,14 @@ def complete_lifecycle_action(
         logger.info(
             f"Completed lifecycle action for {instance_id} with result {result}"
         )
-    except ClientError as e:
+    except AWS_ERRORS as e:
         logger.error(f"Failed to complete lifecycle action: {e}")
 
 
+@instrumented
 def handle_instance_launching(
     event_detail: dict,
-    eip_allocation_id: str,
+    eip_allocation_ids: list,
     deployment_mode: str,
     prefer_on_demand: bool = False,
 ) -> dict:
@@ -200,6 +862,7 @@ def handle_instance_launching(
     logger.info(
         f"Instance launching: {instance_id} in {asg_name}, destination: {destination}"
     )
+    metrics.properties.update(InstanceId=instance_id, AutoScalingGroupName=asg_name)
 
     # Skip EIP association for instances going to warm pool (pre-provisioned standby)
     # These instances will be stopped/hibernated and don't need the EIP yet
@@ -207,45 +870,70 @@ def handle_instance_launching(
         logger.info(
             f"Instance {instance_id} is going to warm pool, skipping EIP association"
         )
+        metrics.decision = "skip"
         success = True
     else:
         # Check current EIP state
-        eip_info = get_eip_info(eip_allocation_id)
-        current_eip_instance = eip_info.get("InstanceId")
-
-        if not current_eip_instance:
-            # No instance has EIP - associate with launching instance
-            # For hot-standby with prefer_on_demand, check if on-demand should get it instead
-            if deployment_mode == "hot-standby" and prefer_on_demand:
-                launching_lifecycle = get_instance_lifecycle(instance_id)
-                if launching_lifecycle == "spot":
-                    # Launching is spot - check if on-demand exists
+        eip_infos = get_eip_infos(eip_allocation_ids)
+        unassociated = [
+            a
+            for a in eip_allocation_ids
+            if a in eip_infos and not eip_infos[a].get("InstanceId")
+        ]
+
+        if unassociated:
+            # Some EIPs have no instance - launching instance is the default target
+            candidates = [instance_id]
+            if deployment_mode == "hot-standby":
+                # With prefer_on_demand, an existing on-demand beats a launching spot
+                launching_is_spot = (
+                    prefer_on_demand and get_instance_lifecycle(instance_id) == "spot"
+                )
+                # Several free EIPs are spread across the other healthy instances too
+                if launching_is_spot or len(unassociated) > 1:
+                    probe_results = {}
                     healthy = get_healthy_instances(
-                        asg_name, exclude_instance_id=None, prefer_on_demand=True
+                        asg_name,
+                        exclude_instance_id=instance_id,
+                        prefer_on_demand=prefer_on_demand,
+                        probe_results=probe_results,
                     )
-                    on_demand_targets = [
-                        inst_id for inst_id, lifecycle in healthy
-                        if inst_id != instance_id and lifecycle != "spot"
-                    ]
-                    if on_demand_targets:
-                        logger.info(
-                            f"Launching spot {instance_id}, but on-demand {on_demand_targets[0]} exists - giving EIP to on-demand"
-                        )
-                        success = associate_eip(eip_allocation_id, on_demand_targets[0])
+                    if launching_is_spot:
+                        # Only on-demand instances passing the probe (if any ran)
+                        # beat the launching spot; the rest keep their ranking
+                        on_demand_targets = [
+                            inst_id for inst_id, lifecycle in healthy
+                            if lifecycle != "spot"
+                            and probe_results.get(inst_id, 0) is not None
+                        ]
+                        other_targets = [
+                            inst_id for inst_id, _ in healthy
+                            if inst_id not in on_demand_targets
+                        ]
+                        candidates = on_demand_targets + [instance_id] + other_targets
                     else:
-                        success = associate_eip(eip_allocation_id, instance_id)
-                else:
-                    success = associate_eip(eip_allocation_id, instance_id)
-            else:
-                success = associate_eip(eip_allocation_id, instance_id)
+                        candidates += healthy_instance_ids(healthy, prefer_on_demand)
+
+            assignments = plan_eip_assignments(eip_allocation_ids, eip_infos, candidates)
+            if assignments and assignments[0][1] != instance_id:
+                logger.info(
+                    f"Launching spot {instance_id}, but on-demand {assignments[0][1]} exists - giving EIP to on-demand"
+                )
+            results = associate_eips(assignments)
+            success = all(results.values())
+            metrics.decision = "associate"
+            if any(results.values()):
+                metrics.mark_associated()
         else:
-            # EIP already on another instance (rolling update scenario)
+            # EIPs already on other instances (rolling update scenario)
             # DON'T steal EIP - launching instance hasn't passed health checks yet
             # Let termination hook handle transfer when old instance terminates
+            holders = [eip_infos[a].get("InstanceId") for a in eip_infos]
             logger.info(
-                f"EIP already on {current_eip_instance}, skipping association. "
-                f"Termination hook will transfer EIP when {current_eip_instance} terminates."
+                f"EIPs already on {holders}, skipping association. "
+                f"Termination hook will transfer EIP when the holder terminates."
             )
+            metrics.decision = "skip"
             success = True
 
     # Complete lifecycle action if this was triggered by lifecycle hook
@@ -258,9 +946,10 @@ def handle_instance_launching(
     return {"statusCode": 200, "body": f"Instance {instance_id} launch handled"}
 
 
+@instrumented
 def handle_instance_terminating(
     event_detail: dict,
-    eip_allocation_id: str,
+    eip_allocation_ids: list,
     deployment_mode: str,
     asg_name_env: str,
     prefer_on_demand: bool = False,
@@ -272,13 +961,18 @@ def handle_instance_terminating(
     lifecycle_action_token = event_detail.get("LifecycleActionToken")
 
     logger.info(f"Instance terminating: {instance_id}")
+    metrics.properties.update(InstanceId=instance_id, AutoScalingGroupName=asg_name)
+    metrics.decision = "skip"
 
-    eip_info = get_eip_info(eip_allocation_id)
+    eip_infos = get_eip_infos(eip_allocation_ids)
 
-    # Check if the terminating instance has the EIP
-    if eip_info.get("InstanceId") == instance_id:
+    # Check if the terminating instance has any of the EIPs
+    held = [
+        a for a in eip_infos if eip_infos[a].get("InstanceId") == instance_id
+    ]
+    if held:
         logger.info(
-            f"Terminating instance {instance_id} has the EIP, initiating failover"
+            f"Terminating instance {instance_id} has EIP {held}, initiating failover"
         )
 
         if deployment_mode == "hot-standby":
@@ -291,25 +985,41 @@ def handle_instance_terminating(
             )
 
             if healthy_instances:
+                # Targets skip instances already holding one of this ASG's EIPs
+                assignments = plan_eip_assignments(
+                    eip_allocation_ids,
+                    eip_infos,
+                    healthy_instance_ids(healthy_instances, prefer_on_demand),
+                    exclude_instance_ids=[instance_id],
+                )
+
                 # Disassociate from terminating instance
-                if eip_info.get("AssociationId"):
-                    disassociate_eip(eip_info["AssociationId"])
+                for allocation_id, _ in assignments:
+                    if eip_infos[allocation_id].get("AssociationId"):
+                        disassociate_eip(eip_infos[allocation_id]["AssociationId"])
 
-                # Associate with first healthy instance (on-demand first if preferred)
-                # When prefer_on_demand=True, returns tuples; otherwise plain instance IDs
-                if prefer_on_demand:
-                    target_instance = healthy_instances[0][0]  # Extract ID from tuple
-                else:
-                    target_instance = healthy_instances[0]
-                success = associate_eip(eip_allocation_id, target_instance)
-                logger.info(f"Failed over EIP to {target_instance}: {success}")
+                # Associate with healthy instances (on-demand first if preferred)
+                results = associate_eips(assignments)
+                metrics.decision = "failover"
+                if any(results.values()):
+                    metrics.mark_associated()
+                for allocation_id, target_instance in assignments:
+                    logger.info(
+                        f"Failed over EIP {allocation_id} to {target_instance}: "
+                        f"{results[allocation_id]}"
+                    )
+                if len(assignments) < len(held):
+                    logger.warning("Not enough healthy instances to fail over every EIP")
             else:
                 logger.warning("No healthy instances available for failover")
+                metrics.decision = "none-healthy"
         else:
             # Cold standby: ASG will launch new instance, Lambda will handle association
-            if eip_info.get("AssociationId"):
-                disassociate_eip(eip_info["AssociationId"])
+            for allocation_id in held:
+                if eip_infos[allocation_id].get("AssociationId"):
+                    disassociate_eip(eip_infos[allocation_id]["AssociationId"])
             logger.info("Cold standby: EIP disassociated, waiting for new instance")
+            metrics.decision = "disassociate"
 
     # Complete lifecycle action
     if lifecycle_hook_name and lifecycle_action_token:
@@ -324,25 +1034,407 @@ def handle_instance_terminating(
     return {"statusCode": 200, "body": f"Instance {instance_id} termination handled"}
 
 
+@instrumented
+def handle_spot_interruption(
+    event_detail: dict,
+    eip_mappings: dict,
+    deployment_mode: str,
+    prefer_on_demand: bool = False,
+) -> dict:
+    """Handle EC2 Spot Instance Interruption Warning / Rebalance Recommendation.
+
+    The terminate lifecycle hook only fires late in a spot reclaim, leaving little
+    of the 2-minute warning for the EIP move. This moves the EIP as soon as the
+    warning arrives, but only when the interrupted instance is the current holder.
+    The later terminate lifecycle action then finds the EIP already moved and
+    only completes the hook. Planning runs under the per-ASG lock with a fresh
+    DescribeAddresses, since warnings for several holders of one ASG arrive
+    together.
+    """
+    instance_id = event_detail["instance-id"]
+
+    logger.info(f"Spot interruption signal for instance: {instance_id}")
+    metrics.properties["InstanceId"] = instance_id
+    metrics.decision = "skip"
+
+    if deployment_mode != "hot-standby":
+        logger.info("Cold standby: no standby to move EIP to, waiting for lifecycle hook")
+        return {"statusCode": 200, "body": f"Instance {instance_id} interruption ignored"}
+
+    eip_infos = get_eip_infos(
+        [a for allocation_ids in eip_mappings.values() for a in allocation_ids]
+    )
+
+    # Spot events carry no ASG name, so EIP ownership is the only filter:
+    # events for unrelated instances in the account are ignored here
+    affected_asgs = [
+        asg_name
+        for asg_name, allocation_ids in eip_mappings.items()
+        if any(
+            eip_infos.get(a, {}).get("InstanceId") == instance_id
+            for a in allocation_ids
+        )
+    ]
+    if not affected_asgs:
+        logger.info(
+            f"Instance {instance_id} does not hold a managed EIP, nothing to do. "
+            f"Termination hook will handle it if it is in a managed ASG."
+        )
+        return {"statusCode": 200, "body": f"Instance {instance_id} interruption ignored"}
+
+    # A coalescing leader may hold the lock for its window plus one reconcile
+    deadline = time.monotonic() + 2 * (
+        COALESCE_WINDOW_SECONDS + RECONCILE_LOCK_TTL_SECONDS
+    )
+    locked = [a for a in affected_asgs if acquire_asg_lock(lock_store, a, deadline)]
+    if len(locked) < len(affected_asgs):
+        logger.warning(
+            f"Timed out waiting for the EIP lock of "
+            f"{[a for a in affected_asgs if a not in locked]}, "
+            f"leaving them to the termination hook"
+        )
+        if not locked:
+            return {"statusCode": 200, "body": f"Instance {instance_id} interruption deferred"}
+    try:
+        # Another warning may have moved EIPs while this one waited
+        eip_infos = get_eip_infos(
+            [a for asg_name in locked for a in eip_mappings[asg_name]]
+        )
+        healthy_by_asg = get_healthy_instances_batch(
+            locked,
+            exclude_instance_ids=[instance_id],
+            prefer_on_demand=prefer_on_demand,
+        )
+
+        assignments = []
+        for asg_name in locked:
+            assignments += plan_eip_assignments(
+                eip_mappings[asg_name],
+                eip_infos,
+                healthy_instance_ids(healthy_by_asg[asg_name], prefer_on_demand),
+                exclude_instance_ids=[instance_id],
+            )
+
+        if not assignments:
+            logger.warning(
+                f"No healthy instances available for proactive failover from {instance_id}"
+            )
+            metrics.decision = "none-healthy"
+            return {"statusCode": 200, "body": f"Instance {instance_id} interruption handled"}
+
+        # AllowReassociation moves the EIP in a single call, no disassociate gap
+        results = associate_eips(assignments)
+    finally:
+        for asg_name in locked:
+            lock_store.release(f"reconcile:{asg_name}")
+    metrics.decision = "failover"
+    if any(results.values()):
+        metrics.mark_associated()
+    for allocation_id, target_instance in assignments:
+        logger.info(
+            f"Proactively failed over EIP {allocation_id} to {target_instance}: "
+            f"{results[allocation_id]}"
+        )
+
+    return {"statusCode": 200, "body": f"Instance {instance_id} interruption handled"}
+
+
+@instrumented
+def reconcile_eips(eip_mappings: dict, prefer_on_demand: bool = False) -> dict:
+    """Associate every unassociated EIP with a healthy instance of its ASG.
+
+    Uses two DescribeAddresses (before and after taking the per-ASG locks),
+    one DescribeAutoScalingGroups and (with prefer_on_demand) one
+    DescribeInstances call regardless of fleet size, followed by one
+    AssociateAddress per EIP that needs a home. ASGs whose lock is held are
+    being placed by another invocation and are left to the next run.
+    """
+    eip_infos = get_eip_infos(
+        [a for allocation_ids in eip_mappings.values() for a in allocation_ids]
+    )
+
+    pending_asgs = [
+        asg_name
+        for asg_name, allocation_ids in eip_mappings.items()
+        if any(a in eip_infos and not eip_infos[a].get("InstanceId") for a in allocation_ids)
+    ]
+    if not pending_asgs:
+        logger.info("All managed EIPs are associated, nothing to reconcile")
+        metrics.decision = "skip"
+        return {"statusCode": 200, "body": "Reconciled 0 EIP associations"}
+
+    locked = [
+        a for a in pending_asgs if acquire_asg_lock(lock_store, a, time.monotonic())
+    ]
+    if len(locked) < len(pending_asgs):
+        logger.info(
+            f"EIPs of {[a for a in pending_asgs if a not in locked]} are being "
+            f"placed by another invocation, skipping them"
+        )
+        if not locked:
+            metrics.decision = "skip"
+            return {"statusCode": 200, "body": "Reconciled 0 EIP associations"}
+    try:
+        # Fresh state under the locks; the first describe only found the ASGs
+        eip_infos = get_eip_infos(
+            [a for asg_name in locked for a in eip_mappings[asg_name]]
+        )
+        healthy_by_asg = get_healthy_instances_batch(
+            locked, prefer_on_demand=prefer_on_demand
+        )
+
+        assignments = []
+        for asg_name in locked:
+            assignments += plan_eip_assignments(
+                eip_mappings[asg_name],
+                eip_infos,
+                healthy_instance_ids(healthy_by_asg[asg_name], prefer_on_demand),
+            )
+
+        results = associate_eips(assignments)
+    finally:
+        for asg_name in locked:
+            lock_store.release(f"reconcile:{asg_name}")
+    succeeded = sum(results.values())
+    metrics.decision = "associate" if assignments else "none-healthy"
+    if succeeded:
+        metrics.mark_associated()
+    logger.info(f"Reconciled {succeeded}/{len(assignments)} EIP associations")
+    return {
+        "statusCode": 200,
+        "body": f"Reconciled {succeeded}/{len(assignments)} EIP associations",
+    }
+
+
+def reconcile_asg(
+    asg_name: str,
+    eip_allocation_ids: list,
+    deployment_mode: str,
+    prefer_on_demand: bool = False,
+    eip_infos: dict = None,
+) -> list:
+    """Place one ASG's EIPs from its current state in a single pass.
+
+    EIPs that are unassociated or held by a Terminating instance go to the
+    remaining instances: InService first, then launching (Pending) ones, then
+    InService instances failing the health probe, with on-demand ahead of spot
+    when prefer_on_demand. EIPs on other instances stay put. eip_infos saves the
+    DescribeAddresses call when the caller just made it (an empty result from
+    a failed describe is retried). Returns the (allocation_id, instance_id)
+    assignments made.
+    """
+    if not eip_infos:
+        eip_infos = get_eip_infos(eip_allocation_ids)
+    states = get_asg_instance_states([asg_name])[asg_name]
+
+    leaving = [i for i, state in states.items() if state.startswith("Terminating")]
+    in_service = [i for i, state in states.items() if state == "InService"]
+    launching = [i for i, state in states.items() if state in PENDING_STATES]
+
+    unplaced = [
+        a
+        for a in eip_allocation_ids
+        if a in eip_infos
+        and (
+            not eip_infos[a].get("InstanceId")
+            or eip_infos[a]["InstanceId"] in leaving
+        )
+    ]
+    if not unplaced:
+        logger.info(f"{asg_name}: EIP placement already up to date")
+        metrics.decision = "skip"
+        return []
+
+    failed_probe = []
+    if (prefer_on_demand or HEALTH_CHECK_PORT) and (in_service or launching):
+        # Only InService apps can be probed; those failing go after launching ones
+        details = get_instance_details_batch(in_service + launching)
+        probe_results = probe_candidates(in_service, details)
+        in_service = rank_instances(in_service, details, probe_results, prefer_on_demand)
+        launching = rank_instances(launching, details, {}, prefer_on_demand)
+        failed_probe = [i for i in in_service if probe_results.get(i, 0) is None]
+        in_service = [i for i in in_service if i not in failed_probe]
+
+    assignments = plan_eip_assignments(
+        eip_allocation_ids,
+        eip_infos,
+        in_service + launching + failed_probe,
+        exclude_instance_ids=leaving,
+    )
+
+    # AllowReassociation moves EIPs off leaving instances in a single call
+    results = associate_eips(assignments)
+    if any(results.values()):
+        metrics.mark_associated()
+    for allocation_id, target_instance in assignments:
+        logger.info(
+            f"{asg_name}: placed EIP {allocation_id} on {target_instance}: "
+            f"{results[allocation_id]}"
+        )
+
+    moved = dict(assignments)
+    stranded = [a for a in unplaced if a not in moved and eip_infos[a].get("InstanceId")]
+    if any(eip_infos[a].get("InstanceId") in leaving for a in moved):
+        metrics.decision = "failover"
+    elif moved:
+        metrics.decision = "associate"
+    elif stranded and deployment_mode != "hot-standby":
+        metrics.decision = "disassociate"
+    else:
+        metrics.decision = "none-healthy"
+
+    if stranded:
+        if deployment_mode == "hot-standby":
+            logger.warning(f"{asg_name}: no healthy instances for EIPs {stranded}")
+        else:
+            # Cold standby: release EIP, the next launch will pick it up
+            for allocation_id in stranded:
+                if eip_infos[allocation_id].get("AssociationId"):
+                    disassociate_eip(eip_infos[allocation_id]["AssociationId"])
+
+    return assignments
+
+
+def wait_for_lock_release(store, key: str, deadline: float) -> None:
+    """Poll until key is released or the monotonic deadline passes.
+
+    The interval doubles from LOCK_POLL_SECONDS up to LOCK_POLL_MAX_SECONDS.
+    """
+    delay = LOCK_POLL_SECONDS
+    while store.held(key) and time.monotonic() < deadline:
+        time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        delay = min(delay * 2, LOCK_POLL_MAX_SECONDS)
+
+
+def acquire_asg_lock(store, asg_name: str, deadline: float) -> bool:
+    """Take the per-ASG reconcile lock, waiting for its holder until the deadline.
+
+    Everything that plans EIP placement for an ASG from a DescribeAddresses
+    snapshot holds this lock, so two invocations never pick the same free
+    instance. Pass the current time as deadline to try only once.
+    """
+    key = f"reconcile:{asg_name}"
+    while not store.acquire(key, RECONCILE_LOCK_TTL_SECONDS):
+        if time.monotonic() >= deadline:
+            return False
+        wait_for_lock_release(store, key, deadline)
+    return True
+
+
+@instrumented
+def handle_lifecycle_coalesced(
+    event_detail: dict,
+    eip_allocation_ids: list,
+    deployment_mode: str,
+    prefer_on_demand: bool = False,
+    window_seconds: float = COALESCE_WINDOW_SECONDS,
+    store=None,
+    terminating: bool = False,
+) -> dict:
+    """Handle a launch or terminate lifecycle action as part of a burst.
+
+    The first invocation for an ASG becomes the leader: it waits window_seconds
+    for the rest of the burst to land, then runs one reconcile_asg from current
+    state if its own event still needs it. Other invocations wait for the
+    leader to finish and only act themselves if their instance still needs
+    it: it holds an EIP while terminating, an EIP is still unassociated, or
+    the EIPs could not be described. A launching instance holding an EIP is
+    already done. Every invocation completes its own lifecycle action.
+    """
+    store = store or lock_store
+    instance_id = event_detail["EC2InstanceId"]
+    asg_name = event_detail["AutoScalingGroupName"]
+    lifecycle_hook_name = event_detail.get("LifecycleHookName")
+    lifecycle_action_token = event_detail.get("LifecycleActionToken")
+    destination = event_detail.get("Destination", "AutoScalingGroup")
+
+    logger.info(f"Lifecycle action for {instance_id} in {asg_name} (coalesced)")
+    metrics.properties.update(InstanceId=instance_id, AutoScalingGroupName=asg_name)
+    metrics.decision = "skip"
+
+    lock_key = f"reconcile:{asg_name}"
+    lock_ttl = window_seconds + RECONCILE_LOCK_TTL_SECONDS
+    deadline = time.monotonic() + 2 * lock_ttl
+
+    def pending(eip_infos: dict) -> bool:
+        # Other terminating holders are re-checked by their own invocations
+        return len(eip_infos) < len(eip_allocation_ids) or any(
+            not info.get("InstanceId")
+            or (terminating and info["InstanceId"] == instance_id)
+            for info in eip_infos.values()
+        )
+
+    # Warm pool instances never need the EIP
+    while destination != "WarmPool":
+        if store.acquire(lock_key, lock_ttl):
+            try:
+                time.sleep(window_seconds)
+                eip_infos = get_eip_infos(eip_allocation_ids)
+                if pending(eip_infos):
+                    reconcile_asg(
+                        asg_name,
+                        eip_allocation_ids,
+                        deployment_mode,
+                        prefer_on_demand,
+                        eip_infos=eip_infos,
+                    )
+                else:
+                    logger.info(f"{asg_name}: EIP placement already up to date")
+            finally:
+                store.release(lock_key)
+            break
+
+        # Another invocation is reconciling this ASG, let it cover this event
+        wait_for_lock_release(store, lock_key, deadline)
+        if not pending(get_eip_infos(eip_allocation_ids)):
+            break
+        if time.monotonic() >= deadline:
+            break
+        # The burst was already waited out by the previous leader
+        window_seconds = 0
+
+    if lifecycle_hook_name and lifecycle_action_token:
+        complete_lifecycle_action(
+            asg_name,
+            lifecycle_hook_name,
+            instance_id,
+            lifecycle_action_token,
+            "CONTINUE",
+        )
+
+    return {"statusCode": 200, "body": f"Instance {instance_id} lifecycle coalesced"}
+
+
+# First invocation in this container reports the cold-start budget
+cold_start = True
+
+
 def lambda_handler(event, context):
     """Main Lambda handler.
 
-    Handles ASG lifecycle events only. EC2 state-change events are NOT used
-    because ASG lifecycle hooks cover all termination scenarios including:
+    Handles ASG lifecycle events, plus EC2 spot interruption warnings and
+    rebalance recommendations for early failover, and scheduled events for a
+    fleet-wide reconcile. EC2 state-change events are NOT used because ASG
+    lifecycle hooks cover all termination scenarios including:
     - Manual termination (console/CLI/API)
     - Spot interruptions
     - Health check failures
     - Scale-in events
     """
     logger.info(f"Received event: {json.dumps(event)}")
+    metrics.reset(event.get("time"))
 
-    # Validate configuration (read at module level for efficiency)
-    if not EIP_ALLOCATION_ID:
-        logger.error("EIP_ALLOCATION_ID environment variable not set")
-        return {"statusCode": 500, "body": "Configuration error"}
+    global cold_start
+    if cold_start:
+        cold_start = False
+        metrics.init_ms = INIT_DURATION_MS
+        metrics.properties["ColdStart"] = True
 
-    if not ASG_NAME:
-        logger.error("ASG_NAME environment variable not set")
+    # Validate configuration (read at module level for efficiency)
+    if not EIP_MAPPINGS:
+        logger.error(
+            "EIP_MAPPINGS (or EIP_ALLOCATION_ID and ASG_NAME) environment variable not set"
+        )
         return {"statusCode": 500, "body": "Configuration error"}
 
     # Handle EventBridge ASG lifecycle events
@@ -353,27 +1445,87 @@ def lambda_handler(event, context):
     detail_type = event["detail-type"]
     event_detail = event["detail"]
 
-    # Validate ASG name matches expected (defense in depth)
+    # EventBridge delivers at-least-once: drop redeliveries of the same action.
+    # The key is first claimed only for this invocation's lifetime, and kept
+    # for the full retry window once the event has been handled.
+    event_key = event_detail.get("LifecycleActionToken") or event.get("id")
+    if context is not None:
+        in_progress_ttl = context.get_remaining_time_in_millis() / 1000
+    else:
+        in_progress_ttl = EVENT_IN_PROGRESS_TTL_SECONDS
+    if event_key and not lock_store.acquire(
+        f"event:{event_key}", in_progress_ttl + EVENT_IN_PROGRESS_MARGIN_SECONDS
+    ):
+        logger.info(f"Event {event_key} already processed, ignoring duplicate")
+        return {"statusCode": 200, "body": "Duplicate event ignored"}
+
+    try:
+        response = dispatch_event(event_detail, detail_type)
+    except Exception:
+        # Let a retry of a failed invocation run again
+        if event_key:
+            lock_store.release(f"event:{event_key}")
+        raise
+
+    if event_key:
+        lock_store.renew(f"event:{event_key}", IDEMPOTENCY_TTL_SECONDS)
+    return response
+
+
+def dispatch_event(event_detail: dict, detail_type: str) -> dict:
+    """Route an EventBridge event to its handler."""
+    # https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/spot-instance-termination-notices.html
+    # EC2 events have no AutoScalingGroupName; the handler filters on EIP ownership
+    if detail_type in SPOT_INTERRUPTION_DETAIL_TYPES:
+        return handle_spot_interruption(
+            event_detail,
+            EIP_MAPPINGS,
+            DEPLOYMENT_MODE,
+            PREFER_ON_DEMAND,
+        )
+
+    # https://docs.aws.amazon.com/eventbridge/latest/userguide/eb-create-rule-schedule.html
+    if detail_type == "Scheduled Event":
+        return reconcile_eips(EIP_MAPPINGS, PREFER_ON_DEMAND)
+
+    # Validate ASG name is one we manage (defense in depth)
     event_asg_name = event_detail.get("AutoScalingGroupName")
 
     # Sanity Check
-    if event_asg_name != ASG_NAME:
+    if event_asg_name not in EIP_MAPPINGS:
         logger.warning(
-            f"ASG name mismatch: expected '{ASG_NAME}', got '{event_asg_name}'. Ignoring event."
+            f"ASG name mismatch: expected one of {list(EIP_MAPPINGS)}, got '{event_asg_name}'. Ignoring event."
         )
         return {"statusCode": 200, "body": "ASG name mismatch, event ignored"}
 
+    eip_allocation_ids = EIP_MAPPINGS[event_asg_name]
+
+    # Handlers planning from their own snapshots would pick the same free
+    # instance for two EIPs, so multi-EIP ASGs are always reconciled under the lock
+    if (COALESCE_WINDOW_SECONDS > 0 or len(eip_allocation_ids) > 1) and detail_type in (
+        "EC2 Instance-launch Lifecycle Action",
+        "EC2 Instance-terminate Lifecycle Action",
+    ):
+        return handle_lifecycle_coalesced(
+            event_detail,
+            eip_allocation_ids,
+            DEPLOYMENT_MODE,
+            PREFER_ON_DEMAND,
+            window_seconds=COALESCE_WINDOW_SECONDS,
+            terminating=detail_type == "EC2 Instance-terminate Lifecycle Action",
+        )
+
     # https://docs.aws.amazon.com/autoscaling/ec2/userguide/lifecycle-hooks.html
     if detail_type == "EC2 Instance-launch Lifecycle Action":
         return handle_instance_launching(
-            event_detail, EIP_ALLOCATION_ID, DEPLOYMENT_MODE, PREFER_ON_DEMAND
+            event_detail, eip_allocation_ids, DEPLOYMENT_MODE, PREFER_ON_DEMAND
         )
     elif detail_type == "EC2 Instance-terminate Lifecycle Action":
         return handle_instance_terminating(
             event_detail,
-            EIP_ALLOCATION_ID,
+            eip_allocation_ids,
             DEPLOYMENT_MODE,
-            ASG_NAME,
+            event_asg_name,
             PREFER_ON_DEMAND,
         )
 
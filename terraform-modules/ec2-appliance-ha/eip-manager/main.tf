@@ -27,7 +27,7 @@ resource "aws_lambda_function" "eip_manager" {
   source_code_hash = data.archive_file.lambda.output_base64sha256
   runtime          = "python3.12"
   timeout          = 60
-  memory_size      = 128
+  memory_size      = var.lambda_memory_size
 
   # Note: reserved_concurrent_executions = 1 would prevent race conditions,
   # but requires sufficient account concurrency quota. With only ASG lifecycle
@@ -36,10 +36,25 @@ resource "aws_lambda_function" "eip_manager" {
 
   environment {
     variables = {
-      EIP_ALLOCATION_ID = var.eip_allocation_id
+      EIP_MAPPINGS      = jsonencode(local.eip_mappings)
       DEPLOYMENT_MODE   = var.deployment_mode
-      ASG_NAME          = var.asg_name
       PREFER_ON_DEMAND  = tostring(var.prefer_on_demand)
+      METRICS_NAMESPACE = var.metrics_namespace
+
+      LOCK_TABLE              = local.use_lock_table ? aws_dynamodb_table.locks[0].name : ""
+      COALESCE_WINDOW_SECONDS = tostring(var.coalesce_window_seconds)
+
+      HEALTH_CHECK_PORT            = var.health_check_port != null ? tostring(var.health_check_port) : ""
+      HEALTH_CHECK_PATH            = coalesce(var.health_check_path, "")
+      HEALTH_CHECK_TIMEOUT_SECONDS = tostring(var.health_check_timeout_seconds)
+    }
+  }
+
+  dynamic "vpc_config" {
+    for_each = local.vpc_attached ? [1] : []
+    content {
+      subnet_ids         = var.lambda_subnet_ids
+      security_group_ids = var.lambda_security_group_ids
     }
   }
 
@@ -54,6 +69,26 @@ resource "aws_lambda_permission" "eventbridge" {
   source_arn    = aws_cloudwatch_event_rule.asg_lifecycle.arn
 }
 
+resource "aws_lambda_permission" "eventbridge_spot_interruption" {
+  count = var.spot_interruption_failover ? 1 : 0
+
+  statement_id  = "AllowEventBridgeSpotInterruptionInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.eip_manager.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.spot_interruption[0].arn
+}
+
+resource "aws_lambda_permission" "eventbridge_reconcile" {
+  count = var.reconcile_schedule_expression != null ? 1 : 0
+
+  statement_id  = "AllowEventBridgeReconcileInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.eip_manager.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.reconcile[0].arn
+}
+
 resource "aws_cloudwatch_log_group" "lambda" {
   name              = "/aws/lambda/${aws_lambda_function.eip_manager.function_name}"
   retention_in_days = 14
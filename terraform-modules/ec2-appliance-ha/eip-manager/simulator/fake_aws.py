@@ -0,0 +1,273 @@
+"""
+In-memory fake EC2 / AutoScaling backend for the EIP manager simulator.
+
+Implements only the API calls eip_manager.py makes, with configurable per-call
+latency and throttling. Throttled calls are retried inside the fake the way
+botocore does (exponential backoff, RetryAttempts in ResponseMetadata), and
+raise a botocore ClientError once attempts run out.
+
+The backend also tracks EIP downtime: every EIP that is unassociated or held
+by an instance that is not InService, or whose application is down, counts as
+down until it is placed again. probe() stands in for the Lambda's health probe
+of an instance's private IP.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+
+from botocore.exceptions import ClientError
+
+
+class FakeCloud:
+    """Shared state behind the fake ec2 and autoscaling clients."""
+
+    def __init__(
+        self,
+        latency_ms: float = 50,
+        throttle_rate: float = 0.0,
+        max_attempts: int = 3,
+        time_scale: float = 1.0,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.throttle_rate = throttle_rate
+        self.max_attempts = max_attempts
+        self.time_scale = time_scale
+        self.random = random.Random(seed)
+
+        # instance_id -> {"asg", "state", "lifecycle", "private_ip", "app_healthy"}
+        self.instances = {}
+        self.addresses = {}  # allocation_id -> instance_id or None
+        self.calls = Counter()
+        self.retries = Counter()
+
+        self._lock = threading.RLock()
+        self._next_ip = 9
+        self._down_since = {}
+        self.downtime = Counter()  # allocation_id -> seconds down (scaled back)
+
+        self.ec2 = FakeEC2Client(self)
+        self.autoscaling = FakeAutoScalingClient(self)
+
+    # -- scenario helpers ---------------------------------------------------
+
+    def add_instance(
+        self,
+        asg_name: str,
+        instance_id: str,
+        state="InService",
+        lifecycle="on-demand",
+        app_healthy=True,
+    ) -> None:
+        with self._lock:
+            self._next_ip += 1
+            self.instances[instance_id] = {
+                "asg": asg_name,
+                "state": state,
+                "lifecycle": lifecycle,
+                "private_ip": f"10.0.{self._next_ip // 256}.{self._next_ip % 256}",
+                "app_healthy": app_healthy,
+            }
+            self._track()
+
+    def add_eip(self, allocation_id: str, instance_id: str = None) -> None:
+        with self._lock:
+            self.addresses[allocation_id] = instance_id
+            self._track()
+
+    def set_state(self, instance_id: str, state: str) -> None:
+        with self._lock:
+            self.instances[instance_id]["state"] = state
+            self._track()
+
+    def remove_instance(self, instance_id: str) -> None:
+        """Terminate an instance; like EC2, its EIP is released."""
+        with self._lock:
+            self.instances.pop(instance_id, None)
+            for allocation_id, holder in self.addresses.items():
+                if holder == instance_id:
+                    self.addresses[allocation_id] = None
+            self._track()
+
+    def eip_holders(self) -> dict:
+        with self._lock:
+            return dict(self.addresses)
+
+    def probe(self, private_ip: str, port: int, path: str = None, timeout: float = 1.0):
+        """Health probe of an instance: latency in ms, or None after timeout if down."""
+        with self._lock:
+            healthy = any(
+                i["private_ip"] == private_ip and i["app_healthy"]
+                for i in self.instances.values()
+            )
+        if not healthy:
+            time.sleep(timeout)  # timeout is already a scaled, real duration
+            return None
+        time.sleep(self.latency_ms / 10 / 1000 * self.time_scale)
+        return self.latency_ms / 10
+
+    def finish(self) -> None:
+        """Close any open downtime intervals."""
+        with self._lock:
+            now = time.monotonic()
+            for allocation_id, since in self._down_since.items():
+                if since is not None:
+                    self.downtime[allocation_id] += (now - since) / self.time_scale
+                    self._down_since[allocation_id] = now
+
+    def _track(self) -> None:
+        now = time.monotonic()
+        for allocation_id, holder in self.addresses.items():
+            serving = (
+                holder in self.instances
+                and self.instances[holder]["state"] == "InService"
+                and self.instances[holder]["app_healthy"]
+            )
+            since = self._down_since.get(allocation_id)
+            if serving and since is not None:
+                self.downtime[allocation_id] += (now - since) / self.time_scale
+                self._down_since[allocation_id] = None
+            elif not serving and since is None:
+                self._down_since[allocation_id] = now
+
+    # -- call plumbing ------------------------------------------------------
+
+    def call(self, operation: str, fn):
+        """Run fn as one API call with latency, throttling and retries."""
+        self.calls[operation] += 1
+        attempts = 0
+        while True:
+            time.sleep(self.latency_ms / 1000 * self.time_scale)
+            if self.random.random() >= self.throttle_rate:
+                break
+            attempts += 1
+            self.retries[operation] += 1
+            if attempts >= self.max_attempts:
+                raise ClientError(
+                    {
+                        "Error": {"Code": "Throttling", "Message": "Rate exceeded"},
+                        "ResponseMetadata": {"RetryAttempts": attempts},
+                    },
+                    operation,
+                )
+            # botocore-style exponential backoff with full jitter
+            time.sleep(self.random.random() * (2**attempts) * 0.05 * self.time_scale)
+
+        with self._lock:
+            response = fn()
+            self._track()
+        response["ResponseMetadata"] = {"RetryAttempts": attempts}
+        return response
+
+
+class FakeEC2Client:
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+
+    def describe_addresses(self, AllocationIds):
+        def fn():
+            missing = [a for a in AllocationIds if a not in self.cloud.addresses]
+            if missing:
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "InvalidAllocationID.NotFound",
+                            "Message": f"The allocation IDs '{', '.join(missing)}' do not exist",
+                        }
+                    },
+                    "DescribeAddresses",
+                )
+            addresses = []
+            for allocation_id in AllocationIds:
+                holder = self.cloud.addresses[allocation_id]
+                address = {"AllocationId": allocation_id}
+                if holder:
+                    address["InstanceId"] = holder
+                    address["AssociationId"] = f"eipassoc-{allocation_id}"
+                addresses.append(address)
+            return {"Addresses": addresses}
+
+        return self.cloud.call("describe_addresses", fn)
+
+    def describe_instances(self, InstanceIds):
+        def fn():
+            instances = []
+            for instance_id in InstanceIds:
+                instance = {"InstanceId": instance_id}
+                fake = self.cloud.instances.get(instance_id, {})
+                if fake.get("lifecycle") == "spot":
+                    instance["InstanceLifecycle"] = "spot"
+                if fake.get("private_ip"):
+                    instance["PrivateIpAddress"] = fake["private_ip"]
+                instances.append(instance)
+            return {"Reservations": [{"Instances": instances}]}
+
+        return self.cloud.call("describe_instances", fn)
+
+    def associate_address(self, AllocationId, InstanceId, AllowReassociation=False):
+        def fn():
+            # An instance's primary IP holds one EIP; reassociating replaces it
+            for allocation_id, holder in self.cloud.addresses.items():
+                if holder == InstanceId:
+                    self.cloud.addresses[allocation_id] = None
+            self.cloud.addresses[AllocationId] = InstanceId
+            return {"AssociationId": f"eipassoc-{AllocationId}"}
+
+        return self.cloud.call("associate_address", fn)
+
+    def disassociate_address(self, AssociationId):
+        def fn():
+            self.cloud.addresses[AssociationId.removeprefix("eipassoc-")] = None
+            return {}
+
+        return self.cloud.call("disassociate_address", fn)
+
+
+class FakeAutoScalingClient:
+    def __init__(self, cloud: FakeCloud):
+        self.cloud = cloud
+
+    def describe_auto_scaling_groups(self, AutoScalingGroupNames, **kwargs):
+        def fn():
+            groups = []
+            for asg_name in AutoScalingGroupNames:
+                groups.append(
+                    {
+                        "AutoScalingGroupName": asg_name,
+                        "Instances": [
+                            {"InstanceId": instance_id, "LifecycleState": i["state"]}
+                            for instance_id, i in self.cloud.instances.items()
+                            if i["asg"] == asg_name
+                        ],
+                    }
+                )
+            return {"AutoScalingGroups": groups}
+
+        return self.cloud.call("describe_auto_scaling_groups", fn)
+
+    def complete_lifecycle_action(
+        self,
+        AutoScalingGroupName,
+        LifecycleHookName,
+        InstanceId,
+        LifecycleActionToken,
+        LifecycleActionResult,
+    ):
+        def fn():
+            instance = self.cloud.instances.get(InstanceId)
+            if instance is None:
+                return {}
+            if instance["state"] == "Pending:Wait":
+                if LifecycleActionResult == "CONTINUE":
+                    instance["state"] = "InService"
+                else:
+                    self.cloud.instances.pop(InstanceId)
+            elif instance["state"] == "Warmed:Pending:Wait":
+                instance["state"] = "Warmed:Stopped"
+            elif instance["state"] == "Terminating:Wait":
+                self.cloud.remove_instance(InstanceId)
+            return {}
+
+        return self.cloud.call("complete_lifecycle_action", fn)
@@ -0,0 +1,163 @@
+"""
+Checks of the EIP manager's health probes against real local listeners.
+
+The simulator scenarios answer probes from the fake backend, since fake
+private IPs are not reachable. These checks run the real probe_instance /
+probe_instances code over TCP and HTTP against stand-ins on 127.0.0.1:
+
+- a TCP listener that accepts and closes connections
+- an HTTP server answering 200 on /health and 404 elsewhere
+- a listener that accepts but never answers (exercises the probe deadline)
+- a closed port (connection refused)
+
+and check rank_instances on the results.
+
+Usage:
+    python probe_check.py
+"""
+
+import http.server
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+import eip_manager  # noqa: E402
+
+HOST = "127.0.0.1"
+DEADLINE_SECONDS = 0.5
+# Thread startup and scheduling on a loaded machine
+DEADLINE_SLACK_SECONDS = 0.25
+
+
+class HealthHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == "/health" else 404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class Listeners:
+    """Start the local stand-ins; use as a context manager."""
+
+    def __enter__(self):
+        self.http = http.server.ThreadingHTTPServer((HOST, 0), HealthHandler)
+        self.http.daemon_threads = True
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+        self.http_port = self.http.server_address[1]
+
+        self.tcp = socket.create_server((HOST, 0))
+        threading.Thread(target=self._accept_and_close, daemon=True).start()
+        self.tcp_port = self.tcp.getsockname()[1]
+
+        # Accepted by the kernel backlog, but never read from or answered
+        self.silent = socket.create_server((HOST, 0), backlog=16)
+        self.silent_port = self.silent.getsockname()[1]
+
+        with socket.create_server((HOST, 0)) as closed:
+            self.closed_port = closed.getsockname()[1]
+        return self
+
+    def _accept_and_close(self):
+        while True:
+            try:
+                conn, _ = self.tcp.accept()
+            except OSError:
+                return
+            conn.close()
+
+    def __exit__(self, *exc):
+        self.http.shutdown()
+        self.http.server_close()
+        self.tcp.close()
+        self.silent.close()
+
+
+def run_checks() -> list:
+    """Run the probe checks; returns a list of problems (empty = all passed)."""
+    problems = []
+
+    def check(name, ok, detail=""):
+        if not ok:
+            problems.append(f"{name}{': ' + detail if detail else ''}")
+
+    probe = eip_manager.probe_instance
+    with Listeners() as listeners:
+        result = probe(HOST, listeners.tcp_port, timeout=DEADLINE_SECONDS)
+        check("TCP listener passes", result is not None)
+        result = probe(HOST, listeners.closed_port, timeout=DEADLINE_SECONDS)
+        check("closed port fails", result is None, f"got {result}")
+        result = probe(HOST, listeners.http_port, "/health", DEADLINE_SECONDS)
+        check("HTTP 200 passes", result is not None)
+        result = probe(HOST, listeners.http_port, "/missing", DEADLINE_SECONDS)
+        check("HTTP 404 fails", result is None, f"got {result}")
+
+        # More targets than worker threads: queued probes must not extend the deadline
+        silent_targets = {
+            f"i-silent-{n}": HOST for n in range(1, eip_manager.MAX_PARALLEL_PROBES + 9)
+        }
+        start = time.monotonic()
+        silent = eip_manager.probe_instances(
+            silent_targets,
+            listeners.silent_port,
+            "/health",
+            DEADLINE_SECONDS,
+        )
+        elapsed = time.monotonic() - start
+        check(
+            "unanswered probes fail",
+            all(latency is None for latency in silent.values()),
+            f"got {silent}",
+        )
+        check(
+            "probes end at the deadline",
+            elapsed <= DEADLINE_SECONDS + DEADLINE_SLACK_SECONDS,
+            f"took {elapsed:.2f}s for a {DEADLINE_SECONDS}s deadline",
+        )
+
+        serving = eip_manager.probe_instances(
+            {"i-serving": HOST, "i-no-ip": None},
+            listeners.http_port,
+            "/health",
+            DEADLINE_SECONDS,
+        )
+        check("HTTP target passes", serving["i-serving"] is not None, f"got {serving}")
+        check("target without IP fails", serving["i-no-ip"] is None, f"got {serving}")
+
+    details = {
+        "i-silent-1": {"lifecycle": "on-demand"},
+        "i-serving": {"lifecycle": "spot"},
+        "i-no-ip": {"lifecycle": "on-demand"},
+        "i-silent-2": {"lifecycle": "spot"},
+    }
+    probe_results = {i: silent[i] for i in ("i-silent-1", "i-silent-2")}
+    ranked = eip_manager.rank_instances(
+        list(details), details, {**probe_results, **serving}, prefer_on_demand=True
+    )
+    check(
+        "serving spot ranks ahead of failed on-demand",
+        ranked == ["i-serving", "i-silent-1", "i-no-ip", "i-silent-2"],
+        f"got {ranked}",
+    )
+    return problems
+
+
+def main() -> int:
+    eip_manager.logger.setLevel(logging.ERROR)
+    problems = run_checks()
+    for problem in problems:
+        print(f"probe check failed: {problem}")
+    if not problems:
+        print("probe checks: ok")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
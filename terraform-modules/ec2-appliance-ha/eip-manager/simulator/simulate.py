@@ -0,0 +1,442 @@
+"""
+Offline failover simulator and benchmark for the EIP manager Lambda.
+
+Drives eip_manager.lambda_handler with scripted EventBridge event sequences
+against the in-memory backend in fake_aws.py, and reports per scenario:
+API call counts and retries, simulated EIP downtime and total time, and
+whether the final EIP placement is correct.
+
+Each scenario is a list of steps. A step mutates the fake ASG (launch,
+terminate, spot warning) and returns the events it emits; events from one
+step are delivered concurrently, like parallel Lambda invocations. Unlike
+separate Lambda containers they share eip_manager's module-level metrics,
+so EMF output of concurrent invocations is not per invocation.
+
+Usage:
+    python simulate.py
+    python simulate.py --scenario spot-storm --throttle-rate 0.2
+    python simulate.py --coalesce-window 1 --json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+import eip_manager  # noqa: E402
+
+from fake_aws import FakeCloud  # noqa: E402
+from probe_check import run_checks as run_probe_checks  # noqa: E402
+
+
+# ============================================================================
+# Event builders
+# ============================================================================
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def lifecycle_event(
+    kind: str, asg_name: str, instance_id: str, destination="AutoScalingGroup"
+) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "time": now_iso(),
+        "source": "aws.autoscaling",
+        "detail-type": f"EC2 Instance-{kind} Lifecycle Action",
+        "detail": {
+            "EC2InstanceId": instance_id,
+            "AutoScalingGroupName": asg_name,
+            "LifecycleHookName": f"{kind}-hook",
+            "LifecycleActionToken": str(uuid.uuid4()),
+            "Destination": destination,
+        },
+    }
+
+
+def launch(cloud, asg_name, instance_id, lifecycle="on-demand", destination="AutoScalingGroup"):
+    state = "Warmed:Pending:Wait" if destination == "WarmPool" else "Pending:Wait"
+    cloud.add_instance(asg_name, instance_id, state, lifecycle)
+    return lifecycle_event("launch", asg_name, instance_id, destination)
+
+
+def launch_from_warm_pool(cloud, asg_name, instance_id):
+    cloud.set_state(instance_id, "Pending:Wait")
+    return lifecycle_event("launch", asg_name, instance_id)
+
+
+def terminate(cloud, asg_name, instance_id):
+    cloud.set_state(instance_id, "Terminating:Wait")
+    return lifecycle_event("terminate", asg_name, instance_id)
+
+
+def spot_warning(instance_id):
+    return {
+        "id": str(uuid.uuid4()),
+        "time": now_iso(),
+        "source": "aws.ec2",
+        "detail-type": "EC2 Spot Instance Interruption Warning",
+        "detail": {"instance-id": instance_id, "instance-action": "terminate"},
+    }
+
+
+# ============================================================================
+# Scenarios
+# ============================================================================
+
+
+def rolling_refresh(cloud):
+    """Hot standby instance refresh at 50% min healthy, with one duplicate delivery."""
+    cloud.add_instance("app", "i-old-od", lifecycle="on-demand")
+    cloud.add_instance("app", "i-old-spot", lifecycle="spot")
+    cloud.add_eip("eipalloc-app", "i-old-od")
+
+    def terminate_with_redelivery():
+        event = terminate(cloud, "app", "i-old-od")
+        return [event, event]
+
+    steps = [
+        lambda: [launch(cloud, "app", "i-new-od")],
+        terminate_with_redelivery,
+        lambda: [launch(cloud, "app", "i-new-spot", lifecycle="spot")],
+        lambda: [terminate(cloud, "app", "i-old-spot")],
+    ]
+    config = {
+        "eip_mappings": {"app": ["eipalloc-app"]},
+        "deployment_mode": "hot-standby",
+        "prefer_on_demand": True,
+    }
+    return config, steps
+
+
+def refresh_burst(cloud):
+    """All four instances of a multi-EIP ASG replaced in a single burst."""
+    for n in range(4):
+        cloud.add_instance("app", f"i-old-{n}")
+    cloud.add_eip("eipalloc-a", "i-old-0")
+    cloud.add_eip("eipalloc-b", "i-old-1")
+
+    steps = [
+        lambda: [launch(cloud, "app", f"i-new-{n}") for n in range(4)],
+        lambda: [terminate(cloud, "app", f"i-old-{n}") for n in range(4)],
+    ]
+    config = {
+        "eip_mappings": {"app": ["eipalloc-a", "eipalloc-b"]},
+        "deployment_mode": "hot-standby",
+        "prefer_on_demand": False,
+    }
+    return config, steps
+
+
+def spot_storm(cloud, asg_count=4):
+    """Spot reclaim across a fleet: warnings, then terminations, then replacements."""
+    mappings = {}
+    for n in range(asg_count):
+        asg_name = f"appliance-{n}"
+        cloud.add_instance(asg_name, f"i-{n}-spot-1", lifecycle="spot")
+        cloud.add_instance(asg_name, f"i-{n}-spot-2", lifecycle="spot")
+        cloud.add_instance(asg_name, f"i-{n}-od-1")
+        cloud.add_instance(asg_name, f"i-{n}-od-2")
+        cloud.add_eip(f"eipalloc-{n}-a", f"i-{n}-spot-1")
+        cloud.add_eip(f"eipalloc-{n}-b", f"i-{n}-od-1")
+        mappings[asg_name] = [f"eipalloc-{n}-a", f"eipalloc-{n}-b"]
+
+    spots = [(f"appliance-{n}", f"i-{n}-spot-{k}") for n in range(asg_count) for k in (1, 2)]
+    steps = [
+        lambda: [spot_warning(instance_id) for _, instance_id in spots],
+        lambda: [terminate(cloud, asg_name, instance_id) for asg_name, instance_id in spots],
+        lambda: [
+            launch(cloud, asg_name, instance_id + "-replacement", lifecycle="spot")
+            for asg_name, instance_id in spots
+        ],
+    ]
+    config = {
+        "eip_mappings": mappings,
+        "deployment_mode": "hot-standby",
+        "prefer_on_demand": True,
+    }
+    return config, steps
+
+
+def spot_pair(cloud):
+    """Both spot EIP holders of one ASG are interrupted at once, two on-demand are free.
+
+    No terminate step: a later terminate reconcile would repair a lost early move.
+    """
+    cloud.add_instance("app", "i-spot-a", lifecycle="spot")
+    cloud.add_instance("app", "i-spot-b", lifecycle="spot")
+    cloud.add_instance("app", "i-od-c")
+    cloud.add_instance("app", "i-od-d")
+    cloud.add_eip("eipalloc-a", "i-spot-a")
+    cloud.add_eip("eipalloc-b", "i-spot-b")
+
+    steps = [
+        lambda: [spot_warning("i-spot-a"), spot_warning("i-spot-b")],
+    ]
+    config = {
+        "eip_mappings": {"app": ["eipalloc-a", "eipalloc-b"]},
+        "deployment_mode": "hot-standby",
+        "prefer_on_demand": True,
+    }
+    return config, steps
+
+
+def broken_standby(cloud):
+    """Active instance terminates while the on-demand standby's application is down."""
+    cloud.add_instance("app", "i-active")
+    cloud.add_instance("app", "i-standby-broken", app_healthy=False)
+    cloud.add_instance("app", "i-standby-spot", lifecycle="spot")
+    cloud.add_eip("eipalloc-app", "i-active")
+
+    steps = [
+        lambda: [terminate(cloud, "app", "i-active")],
+    ]
+    config = {
+        "eip_mappings": {"app": ["eipalloc-app"]},
+        "deployment_mode": "hot-standby",
+        "prefer_on_demand": True,
+        "health_check_port": 8080,
+    }
+    return config, steps
+
+
+def broken_on_demand(cloud):
+    """Unassociated EIP, the only on-demand instance's application is down, a spot launches."""
+    cloud.add_instance("app", "i-od-broken", app_healthy=False)
+    cloud.add_eip("eipalloc-app")
+
+    steps = [
+        lambda: [launch(cloud, "app", "i-new-spot", lifecycle="spot")],
+    ]
+    config = {
+        "eip_mappings": {"app": ["eipalloc-app"]},
+        "deployment_mode": "hot-standby",
+        "prefer_on_demand": True,
+        "health_check_port": 8080,
+    }
+    return config, steps
+
+
+def warm_pool_wakeup(cloud):
+    """Cold standby: active instance fails, a stopped warm pool instance takes over."""
+    cloud.add_instance("app", "i-active")
+    cloud.add_instance("app", "i-warm", state="Warmed:Stopped")
+    cloud.add_eip("eipalloc-app", "i-active")
+
+    steps = [
+        lambda: [terminate(cloud, "app", "i-active")],
+        lambda: [launch_from_warm_pool(cloud, "app", "i-warm")],
+        lambda: [launch(cloud, "app", "i-warm-refill", destination="WarmPool")],
+    ]
+    config = {
+        "eip_mappings": {"app": ["eipalloc-app"]},
+        "deployment_mode": "cold-standby",
+        "prefer_on_demand": False,
+    }
+    return config, steps
+
+
+SCENARIOS = {
+    "rolling-refresh": rolling_refresh,
+    "refresh-burst": refresh_burst,
+    "spot-storm": spot_storm,
+    "spot-pair": spot_pair,
+    "broken-standby": broken_standby,
+    "broken-on-demand": broken_on_demand,
+    "warm-pool-wakeup": warm_pool_wakeup,
+}
+
+
+# ============================================================================
+# Driver
+# ============================================================================
+
+
+def check_placement(cloud, config) -> list:
+    """Return placement problems: EIPs not on distinct serving instances of their ASG."""
+    problems = []
+    holders = cloud.eip_holders()
+    for asg_name, allocation_ids in config["eip_mappings"].items():
+        in_service = {
+            instance_id: i
+            for instance_id, i in cloud.instances.items()
+            if i["asg"] == asg_name and i["state"] == "InService" and i["app_healthy"]
+        }
+        placed = [holders[a] for a in allocation_ids if holders[a]]
+        if len(set(placed)) != len(placed):
+            problems.append(f"{asg_name}: instance holds more than one EIP")
+        for allocation_id in allocation_ids:
+            holder = holders[allocation_id]
+            if holder not in in_service:
+                if len(in_service) >= len(allocation_ids):
+                    problems.append(f"{allocation_id}: on {holder}, not a serving instance")
+            elif config["prefer_on_demand"] and in_service[holder]["lifecycle"] == "spot":
+                idle_on_demand = [
+                    i for i, inst in in_service.items()
+                    if inst["lifecycle"] != "spot" and i not in placed
+                ]
+                if idle_on_demand:
+                    problems.append(
+                        f"{allocation_id}: on spot {holder} while on-demand "
+                        f"{idle_on_demand[0]} is free"
+                    )
+    return problems
+
+
+def configure(cloud, config, coalesce_window, time_scale) -> None:
+    """Point eip_manager at the fake backend and scenario configuration."""
+    eip_manager.clients.update(ec2=cloud.ec2, autoscaling=cloud.autoscaling)
+    eip_manager.EIP_MAPPINGS = config["eip_mappings"]
+    eip_manager.DEPLOYMENT_MODE = config["deployment_mode"]
+    eip_manager.PREFER_ON_DEMAND = config["prefer_on_demand"]
+    eip_manager.COALESCE_WINDOW_SECONDS = coalesce_window * time_scale
+    eip_manager.LOCK_POLL_SECONDS = 0.5 * time_scale
+    eip_manager.LOCK_POLL_MAX_SECONDS = 2 * time_scale
+    eip_manager.lock_store = eip_manager.MemoryLockStore()
+    # Fake private IPs aren't reachable, so probes are answered by the backend
+    eip_manager.HEALTH_CHECK_PORT = config.get("health_check_port", 0)
+    eip_manager.HEALTH_CHECK_TIMEOUT_SECONDS = 1.0 * time_scale
+    eip_manager.probe_instance = cloud.probe
+
+
+def run_scenario(
+    name: str,
+    latency_ms: float = 50,
+    throttle_rate: float = 0.0,
+    time_scale: float = 1.0,
+    coalesce_window: float = 0,
+    seed: int = 0,
+) -> dict:
+    cloud = FakeCloud(
+        latency_ms=latency_ms,
+        throttle_rate=throttle_rate,
+        time_scale=time_scale,
+        seed=seed,
+    )
+    config, steps = SCENARIOS[name](cloud)
+    real_probe_instance = eip_manager.probe_instance
+    configure(cloud, config, coalesce_window, time_scale)
+
+    invocations = 0
+    errors = []
+    start = time.monotonic()
+    try:
+        for step in steps:
+            events = step()
+            invocations += len(events)
+
+            def invoke(event):
+                try:
+                    eip_manager.lambda_handler(event, None)
+                except Exception as e:  # report, like a failed Lambda invocation
+                    errors.append(f"{event['detail-type']}: {e!r}")
+
+            threads = [threading.Thread(target=invoke, args=(e,)) for e in events]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        # probe_check.py exercises the real probe afterwards
+        eip_manager.probe_instance = real_probe_instance
+    cloud.finish()
+    elapsed = (time.monotonic() - start) / time_scale
+
+    return {
+        "scenario": name,
+        "invocations": invocations,
+        "api_calls": sum(cloud.calls.values()),
+        "api_calls_by_operation": dict(cloud.calls),
+        "retries": sum(cloud.retries.values()),
+        "errors": errors,
+        "eip_downtime_ms": {a: round(s * 1000) for a, s in cloud.downtime.items()},
+        "total_downtime_ms": round(sum(cloud.downtime.values()) * 1000),
+        "simulated_time_ms": round(elapsed * 1000),
+        "placement_problems": check_placement(cloud, config),
+        "final_placement": cloud.eip_holders(),
+    }
+
+
+def print_table(results: list) -> None:
+    header = (
+        f"{'scenario':<18} {'invocations':>11} {'api calls':>9} {'retries':>7} "
+        f"{'downtime ms':>11} {'time ms':>8}  placement"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        placement = "ok" if not r["placement_problems"] else "; ".join(r["placement_problems"])
+        print(
+            f"{r['scenario']:<18} {r['invocations']:>11} {r['api_calls']:>9} "
+            f"{r['retries']:>7} {r['total_downtime_ms']:>11} "
+            f"{r['simulated_time_ms']:>8}  {placement}"
+        )
+        for error in r["errors"]:
+            print(f"{'':<18} error: {error}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    parser.add_argument("--latency-ms", type=float, default=50, help="per API call")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="0-1, per attempt")
+    parser.add_argument(
+        "--time-scale", type=float, default=1.0,
+        help="scale real sleeps (e.g. 0.1 runs 10x faster); reported times are unscaled",
+    )
+    parser.add_argument("--coalesce-window", type=float, default=0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print full results as JSON")
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="show Lambda logs and EMF lines (mixed between concurrent invocations)",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        eip_manager.logger.setLevel(logging.ERROR)
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        output = io.StringIO() if not args.verbose else sys.stdout
+        with contextlib.redirect_stdout(output):
+            results.append(
+                run_scenario(
+                    name,
+                    latency_ms=args.latency_ms,
+                    throttle_rate=args.throttle_rate,
+                    time_scale=args.time_scale,
+                    coalesce_window=args.coalesce_window,
+                    seed=args.seed,
+                )
+            )
+
+    # Scenarios answer probes from the fake backend; exercise the real ones too
+    probe_problems = run_probe_checks()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+    for problem in probe_problems:
+        print(f"probe check failed: {problem}", file=sys.stderr if args.json else sys.stdout)
+    if not probe_problems and not args.json:
+        print("\nprobe checks: ok")
+    failed = any(r["placement_problems"] or r["errors"] for r in results)
+    return 1 if failed or probe_problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,36 @@ variable "name_prefix" {
 }
 
 variable "eip_allocation_id" {
-  description = "Allocation ID of the EIP to manage"
+  description = "Allocation ID of the EIP to manage (single ASG/EIP pair; use eip_mappings for more)"
   type        = string
+  default     = null
 }
 
 variable "asg_name" {
-  description = "Name of the ASG to monitor"
+  description = "Name of the ASG to monitor (single ASG/EIP pair; use eip_mappings for more)"
   type        = string
+  default     = null
 }
 
 variable "asg_arn" {
   description = "ARN of the ASG to monitor (for scoped IAM permissions)"
   type        = string
+  default     = null
+}
+
+variable "eip_mappings" {
+  description = <<-EOT
+    Map of ASG name to the EIP allocation IDs it should hold, e.g. one EIP per AZ or appliance role.
+    Merged with the single eip_allocation_id/asg_name pair. Each instance holds at most one EIP.
+  EOT
+  type        = map(list(string))
+  default     = {}
+}
+
+variable "asg_arns" {
+  description = "ARNs of the ASGs in eip_mappings (for scoped IAM permissions); every mapped ASG needs one"
+  type        = list(string)
+  default     = []
 }
 
 variable "deployment_mode" {
@@ -53,8 +71,131 @@ variable "prefer_on_demand" {
   default     = true
 }
 
+variable "spot_interruption_failover" {
+  description = <<-EOT
+    Move the EIP as soon as its current holder receives an EC2 Spot Instance Interruption
+    Warning or Rebalance Recommendation, instead of waiting for the terminate lifecycle hook.
+
+    Only applies in hot-standby mode. Events for instances that do not hold the EIP are ignored.
+  EOT
+  type        = bool
+  default     = true
+}
+
+variable "reconcile_schedule_expression" {
+  description = "Optional EventBridge schedule (e.g. \"rate(5 minutes)\") that associates every unassociated EIP across all mapped ASGs in one invocation"
+  type        = string
+  default     = null
+}
+
+variable "lock_table_enabled" {
+  description = <<-EOT
+    Create a DynamoDB table so duplicate event deliveries are dropped across all concurrent
+    invocations. Without it, duplicates are only detected within one warm Lambda container.
+    Always created when coalesce_window_seconds > 0 or an ASG maps more than one EIP, since
+    those lifecycle events are then serialized per ASG through the table.
+  EOT
+  type        = bool
+  default     = false
+}
+
+variable "coalesce_window_seconds" {
+  description = <<-EOT
+    Coalesce bursts of lifecycle events (e.g. instance refresh) per ASG: the first event waits
+    this long, then reconciles EIP placement once from current state. 0 handles every event
+    on its own.
+  EOT
+  type        = number
+  default     = 0
+  validation {
+    condition     = var.coalesce_window_seconds >= 0 && var.coalesce_window_seconds <= 10
+    error_message = "coalesce_window_seconds must be between 0 and 10 (Lambda timeout is 60s)"
+  }
+}
+
+variable "lambda_memory_size" {
+  description = "Lambda memory in MB. CPU scales with memory, so larger values shorten cold starts (boto3 client creation)"
+  type        = number
+  default     = 128
+}
+
+variable "metrics_namespace" {
+  description = "CloudWatch namespace for failover metrics emitted as Embedded Metric Format log lines"
+  type        = string
+  default     = "EIPManager"
+}
+
+variable "health_check_port" {
+  description = <<-EOT
+    Probe failover targets on this port of their private IP before moving the EIP; instances
+    failing the probe are used last. null disables probing. Requires lambda_subnet_ids.
+  EOT
+  type        = number
+  default     = null
+}
+
+variable "health_check_path" {
+  description = "HTTP path to GET on health_check_port (status < 400 passes). null uses a TCP connect check"
+  type        = string
+  default     = null
+}
+
+variable "health_check_timeout_seconds" {
+  description = "Overall deadline for probing all failover targets (probes run concurrently)"
+  type        = number
+  default     = 1
+  validation {
+    condition     = var.health_check_timeout_seconds > 0 && var.health_check_timeout_seconds <= 5
+    error_message = "health_check_timeout_seconds must be between 0 and 5"
+  }
+}
+
+variable "lambda_subnet_ids" {
+  description = <<-EOT
+    Subnets to attach the Lambda to, so it can reach instance private IPs for health checks.
+    The subnets need a NAT gateway, or VPC endpoints for EC2 and Auto Scaling plus a DynamoDB
+    gateway endpoint when the lock table exists (multi-EIP ASGs, coalescing, lock_table_enabled).
+    Without DynamoDB access the lock calls fail open, which silently disables deduplication
+    and the per-ASG serialization.
+  EOT
+  type        = list(string)
+  default     = []
+}
+
+variable "lambda_security_group_ids" {
+  description = "Security groups for the VPC-attached Lambda; instances must allow health_check_port from them"
+  type        = list(string)
+  default     = []
+}
+
 variable "tags" {
   description = "Additional tags for resources"
   type        = map(string)
   default     = {}
 }
+
+# ============================================================================
+# Validation Rules
+# ============================================================================
+
+locals {
+  eip_mappings = merge(
+    var.asg_name != null && var.eip_allocation_id != null ? { (var.asg_name) = [var.eip_allocation_id] } : {},
+    var.eip_mappings
+  )
+  eip_allocation_ids = distinct(flatten(values(local.eip_mappings)))
+  asg_arns           = compact(concat([var.asg_arn], var.asg_arns))
+  use_lock_table     = var.lock_table_enabled || var.coalesce_window_seconds > 0 || local.multi_eip_asgs
+  multi_eip_asgs     = anytrue([for ids in values(local.eip_mappings) : length(ids) > 1])
+  vpc_attached       = length(var.lambda_subnet_ids) > 0
+
+  # Validate: at least one ASG/EIP pair configured
+  _validate_eip_mappings = length(local.eip_mappings) == 0 ? tobool("ERROR: set eip_allocation_id and asg_name, or eip_mappings") : true
+
+  # Validate: every mapped ASG has its ARN for the lifecycle IAM statement
+  _unscoped_asgs     = [for name in keys(local.eip_mappings) : name if !anytrue([for arn in local.asg_arns : endswith(arn, ":autoScalingGroupName/${name}")])]
+  _validate_asg_arns = length(local._unscoped_asgs) > 0 ? tobool("ERROR: asg_arn/asg_arns must include an ARN for every mapped ASG") : true
+
+  # Validate: health checks reach private IPs, so the Lambda must run in the VPC
+  _validate_health_check = var.health_check_port != null && !local.vpc_attached ? tobool("ERROR: health_check_port requires lambda_subnet_ids") : true
+}